@@ -1,32 +1,48 @@
 import json
+import logging
 import os
 import random
 import re
 import sys
-from dataclasses import dataclass, field
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from typing import Callable, List, Literal
 
 from PySide6.QtCore import (
+    QCoreApplication,
     QEasingCurve,
     QElapsedTimer,
+    QEvent,
     QObject,
     QPoint,
+    QPointF,
     QPropertyAnimation,
     QRect,
-    Qt,
+    QRectF,
+    QRunnable,
+    QSize,
+    QThreadPool,
     QTimer,
+    Signal,
 )
 from PySide6.QtGui import (
+    QBitmap,
     QBrush,
     QColor,
     QFont,
     QHideEvent,
+    QImage,
     QPainter,
+    QPaintEvent,
     QPen,
     QPixmap,
     QPolygon,
+    QRegion,
+    QResizeEvent,
     QShowEvent,
-    QTransform,
+    Qt,  # QtGui 中的 Qt 额外包含 mightBeRichText
 )
 from PySide6.QtWidgets import (
     QApplication,
@@ -37,9 +53,16 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from frame_archive import FrameArchive, archive_path, compile_keyframes
+from instrument import metrics
+
+logger = logging.getLogger(__name__)
+
+scale = 1.0
+
 
 def init_scale():
-    """初始化缩放"""
+    """初始化缩放，缩放改变后 SequenceFrame 在显示时换用新缩放的序列帧"""
     screen = QApplication.primaryScreen()
     global scale
     scale = screen.logicalDotsPerInch() / 96
@@ -50,11 +73,18 @@ def scaled(position: List[int] | tuple[int, int]):
     return int(position[0] * scale), int((position[1] - 16) * scale)
 
 
-def scaled_frame(frame: QPixmap):
-    """缩放帧"""
+def scaled_bytes(nbytes: int) -> int:
+    """按全局缩放换算解码后帧的内存占用"""
+    return int(nbytes * scale * scale)
+
+
+def scaled_frame(frame: QPixmap | QImage, factor: float | None = None):
+    """缩放帧，factor 为空时使用全局缩放"""
+    if factor is None:
+        factor = scale
     return frame.scaled(
-        int(frame.width() * scale),
-        int(frame.height() * scale),
+        int(frame.width() * factor),
+        int(frame.height() * factor),
         Qt.AspectRatioMode.KeepAspectRatio,
         Qt.TransformationMode.SmoothTransformation,
     )
@@ -108,23 +138,127 @@ def process_position(position: tuple[int | str, int | str], size: tuple[int, int
     return pos
 
 
+class FrameClock(QObject):
+    def __init__(self, parent=None):
+        """全局帧时钟，所有 FrameController 共用一个定时器，只在最近的帧截止时间唤醒
+        截止时间相差不到半个屏幕刷新间隔的控制器在同一次唤醒中更新，彼此保持帧同步
+        """
+        super().__init__(parent)
+        self._controllers: List[FrameController] = []
+        self._elapsed = QElapsedTimer()
+        self._elapsed.start()
+        self._source: Callable[[], float] = self._elapsed.elapsed
+        self._offset = 0.0  # 同步校正量，加在时间源上
+        self._manual = False
+        self._refresh_interval: float | None = None
+        self._last_wake = 0.0
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.tick)
+
+    @property
+    def refresh_interval(self) -> float:
+        """屏幕刷新间隔(ms)，取不到时按 60Hz"""
+        if self._refresh_interval is None:
+            screen = QApplication.primaryScreen()
+            rate = screen.refreshRate() if screen else 0
+            self._refresh_interval = 1000 / (rate if rate > 0 else 60)
+        return self._refresh_interval
+
+    def now(self) -> float:
+        return self._source() + self._offset
+
+    def adjust(self, delta: float):
+        """校正时钟，正值使序列帧跳帧追赶，负值使其停留等待"""
+        self._offset += delta
+        self.schedule()
+
+    def set_time_source(
+        self, source: Callable[[], float] | None = None, manual: bool = False
+    ):
+        """设置时间源(ms)，为空时使用单调时钟
+        manual 为真时不启动定时器，由外部调用 tick 推进
+        """
+        self._source = source or self._elapsed.elapsed
+        self._offset = 0.0
+        self._manual = manual
+        self.schedule()
+
+    def lock_to(self, player, start: int = 0):
+        """锁定到媒体播放位置，媒体暂停时序列帧随之暂停
+        start 为跳转的目标位置，媒体完成跳转前时钟停在这里，不会先按旧位置计时再追赶
+        """
+        if start:
+            self.set_time_source(lambda: max(player.position(), start))
+        else:
+            self.set_time_source(player.position)
+
+    @property
+    def controllers(self) -> List["FrameController"]:
+        return list(self._controllers)
+
+    def add(self, controller: "FrameController"):
+        if controller not in self._controllers:
+            self._controllers.append(controller)
+        self.schedule()
+
+    def remove(self, controller: "FrameController"):
+        if controller in self._controllers:
+            self._controllers.remove(controller)
+        self.schedule()
+
+    def schedule(self):
+        """定时到最近的帧截止时间"""
+        if self._manual or not self._controllers:
+            self._timer.stop()
+            return
+        delay = min(c.next_due for c in self._controllers) - self.now()
+        if delay <= 0:
+            # 已经到期但时间源没有前进（如媒体暂停），等一个刷新间隔再查看
+            delay = self.refresh_interval
+        self._timer.start(int(delay + 0.999))
+
+    def tick(self):
+        """更新所有到期的控制器"""
+        if metrics.enabled:
+            wake = time.perf_counter()
+            if self._last_wake:
+                metrics.record("clock.interval", (wake - self._last_wake) * 1000)
+            self._last_wake = wake
+        now = self.now() + self.refresh_interval / 2
+        for controller in list(self._controllers):
+            if controller.next_due <= now:
+                controller._on_tick(now)
+        self.schedule()
+
+
 class FrameController(QObject):
-    def __init__(self, fps: int = 30, parent=None):
+    def __init__(self, fps: int = 30, parent=None, clock: FrameClock | None = None):
         super().__init__(parent)
         self._fps = max(1, fps)
         self._frame_duration = 1000.0 / self._fps
-        self._timer = QTimer(self)
-        self._timer.setTimerType(Qt.PreciseTimer)
-        self._elapsed = QElapsedTimer()
+        self._clock = clock or frame_clock
+        self._start = 0.0
         self._running = False
         self._loop = True
         self._callback = None
         self._step = 1
         self._current_step = 1  # 记录当前生效的步进值
-        self._timer.setInterval(1000 // 60)
-        self._timer.timeout.connect(self._on_tick)
+        self._last_frame = 0  # 上次回调时的帧序号，相对于 _start
+        self.next_due = 0.0  # 下一帧的截止时间，时钟时间(ms)
 
-    def start(self, callback: Callable[[], None], step: int = 1, loop: bool = True):
+    def start(
+        self,
+        callback: Callable[[int], None],
+        step: int = 1,
+        loop: bool = True,
+        elapsed: float = 0,
+    ):
+        """开始计时，每到期一次以应前进的步数调用 callback
+        落后多步时只调用一次并传入累计步数，由调用方直接跳到目标帧
+        elapsed 为已经播放的时长(ms)，用于跳转后恢复循环，此时立即前进到对应的帧
+        """
         step = max(1, step)
 
         # 已在运行，返回
@@ -135,81 +269,452 @@ class FrameController(QObject):
         if self._running:
             self._current_step = step
             self._step = step
+            self._update_due()
+            self._clock.schedule()
             return
 
-        # 启动
+        # 启动，起点对齐到帧边界，使同帧率的序列帧在同一时刻切换
         self._callback = callback
         self._step = step
         self._current_step = step
         self._loop = loop
-        self._elapsed.start()
-        self._timer.start()
+        now = self._clock.now()
+        self._start = (now - elapsed) // self._frame_duration * self._frame_duration
+        self._last_frame = 0
         self._running = True
+        steps = self.frame_at(now) // self._step
+        if steps > 0:
+            self._last_frame = steps * self._step
+            callback(steps)
+        if not self._running:
+            # 回调中已停止，如关键帧已播放完
+            return
+        self._update_due()
+        self._clock.add(self)
 
     def stop(self):
         if not self._running:
             return
-        self._timer.stop()
+        self._clock.remove(self)
         self._running = False
         self._callback = None
 
     def is_running(self) -> bool:
         return self._running
 
-    def _on_tick(self):
+    def frame_at(self, at: float) -> int:
+        """时钟时间 at 时应显示的帧序号，相对于开始时"""
+        return int((at - self._start) / self._frame_duration)
+
+    @property
+    def frame(self) -> int:
+        """上次回调时的帧序号"""
+        return self._last_frame
+
+    def _update_due(self):
+        self.next_due = (
+            self._start + (self._last_frame + self._step) * self._frame_duration
+        )
+
+    def _on_tick(self, now: float):
         if self._callback is None:
             return
 
-        elapsed_ms = self._elapsed.elapsed()
-        expected_frame = int(elapsed_ms / self._frame_duration)
-
-        if not hasattr(self, "_last_frame"):
+        if now < self._start:
+            # 时间源向后跳转，从当前位置重新开始计时
+            self._start = now // self._frame_duration * self._frame_duration
             self._last_frame = 0
+        expected_frame = self.frame_at(now)
+
+        steps = (expected_frame - self._last_frame) // self._step
+        if steps > 0:
+            self._last_frame += steps * self._step
+            if metrics.enabled:
+                # 唤醒相对截止时间的延迟，以及合并掉的帧数
+                metrics.record(
+                    "tick.jitter", max(0.0, self._clock.now() - self.next_due)
+                )
+                if steps > 1:
+                    metrics.count("frames.dropped", steps - 1)
+                start = time.perf_counter()
+                self._callback(steps)
+                metrics.record("tick.callback", (time.perf_counter() - start) * 1000)
+            else:
+                self._callback(steps)
+        self._update_due()
 
-        delta = expected_frame - self._last_frame
-        if delta >= self._step:
-            for _ in range(delta // self._step):
-                self._callback()
-            self._last_frame = expected_frame
 
+frame_clock = FrameClock()
 
-class SequenceFrame(QLabel):
-    def __init__(self, res_name: str):
-        """序列帧组件
+
+class MediaSync(QObject):
+    def __init__(
+        self,
+        clock: FrameClock | None = None,
+        threshold: float = 40.0,
+        smoothing: float = 0.2,
+        parent=None,
+    ):
+        """监测帧时钟相对媒体播放位置的漂移，超过阈值时校正时钟
+
+        媒体位置的上报粒度较粗，漂移取指数平均后再与阈值比较。
+        帧时钟落后时向前校正，序列帧跳过落下的帧；超前时向后校正，序列帧停留在当前帧。
 
         Args:
-            res_name (str): 序列帧资源目录，帧文件名应是数字
+            clock (FrameClock): 帧时钟，默认为全局时钟
+            threshold (float): 校正阈值(ms)，为 0 时只统计不校正
+            smoothing (float): 指数平均的系数
         """
+        super().__init__(parent)
+        self._clock = clock or frame_clock
+        self.threshold = threshold
+        self.smoothing = smoothing
+        self.drift = 0.0  # 平滑后的漂移(ms)，正值为画面超前
+        self._anchor: float | None = None  # 媒体位置 0 对应的时钟时间
+
+    def reset(self):
+        """媒体跳转后重新对齐"""
+        self._anchor = None
+        self.drift = 0.0
+
+    def update(self, position: int):
+        """传入媒体播放位置(ms)，一般连接到 positionChanged"""
+        now = self._clock.now()
+        if self._anchor is None:
+            self._anchor = now - position
+            return
+
+        drift = now - self._anchor - position
+        if abs(drift) > 1000:
+            # 媒体跳转，不作为漂移处理
+            logger.info("Media jumped by %+.0f ms, resyncing", -drift)
+            self.reset()
+            self._anchor = now - position
+            return
+
+        self.drift += (drift - self.drift) * self.smoothing
+        if metrics.enabled:
+            metrics.record("sync.drift", abs(drift))
+
+        if self.threshold and abs(self.drift) > self.threshold:
+            logger.debug(
+                "Drift %+.0f ms, frame offsets %s, %s",
+                self.drift,
+                self.frame_offsets(position),
+                "holding" if self.drift > 0 else "skipping",
+            )
+            if metrics.enabled:
+                metrics.count("sync.corrections")
+            self._clock.adjust(-self.drift)
+            self.drift = 0.0
+
+    def frame_offsets(self, position: int) -> List[int]:
+        """各运行中控制器的当前帧相对媒体位置应显示帧的偏差，正值为超前"""
+        if self._anchor is None:
+            return []
+        at = self._anchor + position
+        return [c.frame - c.frame_at(at) for c in self._clock.controllers]
+
+
+class _DecodeSignals(QObject):
+    decoded = Signal(int, QImage)
+
+
+class _DecodeTask(QRunnable):
+    def __init__(self, index: int, loader: "FrameLoader"):
+        """单帧解码任务，在线程池中运行"""
         super().__init__()
+        self.index = index
+        self.loader = loader
 
-        self.setStyleSheet(f"background-color: {Color.BG_COLOR.name()};")
-        self.setScaledContents(True)
+    def run(self):
+        try:
+            if self.loader.cancelled:
+                return
+            # QImage 可在子线程中使用，QPixmap 不行，缩放也一并在子线程完成
+            image = self.loader.decode(self.index)
+            if self.loader.scale != 1:
+                image = scaled_frame(image, self.loader.scale)
+            if not self.loader.cancelled:
+                self.loader.signals.decoded.emit(self.index, image)
+        finally:
+            self.loader.task_done()
+
+
+class FrameLoader(QObject):
+    frame_loaded = Signal(int, QImage)
+    finished = Signal()
 
-        # 初始化序列帧
+    def __init__(
+        self,
+        paths: List[str],
+        factor: float,
+        archive: FrameArchive | None = None,
+        parent=None,
+    ):
+        """异步帧加载器，在线程池中将帧解码为 QImage 并缩放，完成后交回 GUI 线程
+
+        Args:
+            paths (List[str]): 帧文件路径，从归档读取时为帧文件名
+            factor (float): 显示缩放系数
+            archive (FrameArchive | None): 序列帧归档，为空时从文件读取
+        """
+        super().__init__(parent)
+        self.paths = paths
+        self.scale = factor
+        self.archive = archive
+        self.pending = len(paths)
+        self.cancelled = False
+        # 尚未结束的解码任务数，包括取消后跳过的任务，归零时关闭归档
+        self._running = len(paths)
+        self._lock = threading.Lock()
+
+        # 信号对象不挂父对象，避免加载器被释放后子线程发射信号出错
+        self.signals = _DecodeSignals()
+        self.signals.decoded.connect(self._on_decoded)
+
+    def start(self):
+        pool = QThreadPool.globalInstance()
+        for index in range(len(self.paths)):
+            pool.start(_DecodeTask(index, self))
+
+    def decode(self, index: int) -> QImage:
+        """解码一帧，在子线程中调用"""
+        if self.archive is not None:
+            return QImage.fromData(self.archive.read(index), "PNG")
+        return QImage(self.paths[index])
+
+    def cancel(self):
+        """取消解码，正在运行的任务结束后关闭归档"""
+        self.cancelled = True
+
+    def task_done(self):
+        """一个解码任务结束，在子线程中调用，最后一个任务结束时关闭归档"""
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+        if last:
+            self.close()
+
+    def close(self):
+        """关闭归档，只能在没有解码任务运行时调用，例如线程池清空并等待结束后"""
+        if self.archive is not None:
+            self.archive.close()
+
+    def _on_decoded(self, index: int, image: QImage):
+        if self.cancelled:
+            return
+        self.pending -= 1
+        self.frame_loaded.emit(index, image)
+        if self.pending == 0:
+            self.finished.emit()
+
+
+class FrameSet(QObject):
+    frame_loaded = Signal(int)
+    ready = Signal()
+
+    def __init__(self, res_name: str, factor: float):
+        """一组序列帧，在后台解码，由 FrameCache 管理，可被多个 SequenceFrame 共用
+
+        Args:
+            res_name (str): 序列帧资源目录，帧文件名应是数字，存在同名归档时优先读取归档
+            factor (float): 显示缩放系数
+        """
+        super().__init__()
+
+        # frames 为按 factor 缩放好的显示帧，缩放后不保留原始帧
+        self.res_name = res_name
+        self.scale = factor
+        self.key = (res_name, factor)
         self.frames: List[QPixmap] = []
         self.frames_index: dict[str, int] = {}
-        self.index = 0
-        self.fps = 30
+        self.keyframes = None
+        self.is_ready = False
+        self.nbytes = 0
+        self.load_ms = 0
+        self._load_timer = QElapsedTimer()
+        self._load_timer.start()
+
+        # 载入帧，未解码的帧以空 QPixmap 占位
+        paths = []
+        archive = None
+        metadata = None
+        if os.path.isfile(archive_path(res_name)):
+            archive = FrameArchive(archive_path(res_name))
+            paths = archive.names
+            self.frames_index = {name: i for i, name in enumerate(paths)}
+            metadata = archive.metadata
+        else:
+            frame_list = sorted(os.listdir(res_name))
+            for frame in frame_list:
+                if frame == "metadata.json":
+                    with open(os.path.join(res_name, frame), encoding="utf-8") as f:
+                        metadata = json.load(f)
+                    continue
+                self.frames_index[frame] = len(paths)
+                paths.append(os.path.join(res_name, frame))
+
+        if not paths:
+            if archive is not None:
+                archive.close()
+            raise ValueError(f"No frames found in {res_name}")
+        if metadata is not None:
+            # 关键帧表：第 i 项为第 i 个源帧对应的帧序号
+            self.keyframes = compile_keyframes(metadata, self.frames_index)
+        self.frames = [QPixmap() for _ in paths]
+
+        # 加载器不挂父对象，序列帧被淘汰后仍在运行的解码任务可以安全结束
+        self.loader = FrameLoader(paths, factor, archive)
+        self.loader.frame_loaded.connect(self._on_frame_loaded)
+        self.loader.finished.connect(self._on_loaded)
+        self.loader.start()
+
+    def _on_frame_loaded(self, index: int, image: QImage):
+        frame = QPixmap.fromImage(image)
+        self.frames[index] = frame
+        self.nbytes += frame.width() * frame.height() * frame.depth() // 8
+        self.frame_loaded.emit(index)
+
+    def _on_loaded(self):
+        self.is_ready = True
+        self.load_ms = self._load_timer.elapsed()
+        logger.info(
+            "%s is inited with %d frames in %d ms",
+            self.res_name,
+            len(self.frames),
+            self.load_ms,
+        )
+        self.ready.emit()
 
-        # 载入帧
-        frame_count = 0
-        frame_list = sorted(os.listdir(res_name))
-        for frame in frame_list:
-            if frame == "metadata.json":
-                with open(os.path.join(res_name, frame), encoding="utf-8") as f:
-                    self.metadata: dict[str, str] = json.load(f)
+    def wait(self):
+        """阻塞到全部帧解码完成，期间只投递已排队的事件，不处理定时器和输入
+        被取消时直接返回
+        """
+        pool = QThreadPool.globalInstance()
+        while not self.is_ready and not self.loader.cancelled:
+            pool.waitForDone(5)
+            QCoreApplication.sendPostedEvents()
+
+    def release(self):
+        """释放资源"""
+        self.loader.cancel()
+        self.frames.clear()
+        self.frames_index.clear()
+        self.keyframes = None
+        self.nbytes = 0
+
+
+class FrameCache:
+    def __init__(self, budget: int = 512 * 1024 * 1024):
+        """进程内共享的序列帧缓存，以 (资源路径, 缩放) 为键
+        总占用超出 budget 字节时，按 LRU 淘汰没有被引用的序列帧
+        """
+        self.budget = budget
+        self.entries: OrderedDict[tuple[str, float], FrameSet] = OrderedDict()
+        self.refs: dict[tuple[str, float], int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(frame_set.nbytes for frame_set in self.entries.values())
+
+    def acquire(self, res_name: str) -> FrameSet:
+        """取得按当前缩放解码的序列帧，未缓存时开始后台解码，用完后需 release"""
+        key = (res_name, scale)
+        frame_set = self.entries.get(key)
+        if frame_set is None:
+            self.misses += 1
+            frame_set = FrameSet(res_name, scale)
+            frame_set.ready.connect(self.trim)
+            self.entries[key] = frame_set
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        self.refs[key] = self.refs.get(key, 0) + 1
+        self.trim()
+        return frame_set
+
+    def release(self, frame_set: FrameSet):
+        """释放引用，序列帧仍保留在缓存中直到被淘汰
+        clear 之后释放的序列帧已不在缓存中，忽略
+        """
+        if self.entries.get(frame_set.key) is not frame_set:
+            return
+        self.refs[frame_set.key] -= 1
+        self.trim()
+
+    def trim(self):
+        """淘汰最久未使用且没有被引用的序列帧，直到不超过预算"""
+        total = self.nbytes
+        for key in list(self.entries):
+            if total <= self.budget:
+                break
+            if self.refs.get(key):
                 continue
-            path = os.path.join(res_name, frame)
-            pixmap = QPixmap(path)
-            self.frames.append(pixmap)
-            self.frames_index[frame] = frame_count
-            frame_count += 1
+            frame_set = self.entries.pop(key)
+            self.refs.pop(key, None)
+            total -= frame_set.nbytes
+            frame_set.release()
+            self.evictions += 1
+
+    def clear(self):
+        """取消所有解码并清空缓存，退出前调用，避免解码任务在对象销毁后发射信号"""
+        frame_sets = list(self.entries.values())
+        for frame_set in frame_sets:
+            frame_set.release()
+        self.entries.clear()
+        self.refs.clear()
+        pool = QThreadPool.globalInstance()
+        pool.clear()
+        pool.waitForDone()
+        # 被清出线程池的任务不会运行，由这里关闭它们的归档
+        for frame_set in frame_sets:
+            frame_set.loader.close()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.nbytes,
+            "budget": self.budget,
+        }
+
+
+frame_cache = FrameCache()
+
+
+class SequenceFrame(QWidget):
+    ready = Signal()
 
-        if not self.frames:
-            raise ValueError(f"No frames found in {res_name}")
-        self.setPixmap(scaled_frame(self.frames[0]))
+    def __init__(self, res_name: str):
+        """序列帧组件，帧取自全局缓存 frame_cache，未缓存时在后台解码，完成后发出 ready 信号
+        只保存当前帧的引用，在 paintEvent 中绘制到整个组件，切换帧时只重绘自身
 
-        print(f"{res_name} is inited with {len(self.frames)} frames")
+        Args:
+            res_name (str): 序列帧资源目录，帧文件名应是数字，存在同名归档时优先读取归档
+        """
+        super().__init__()
+
+        # 组件自行绘制全部区域，不需要先擦除背景
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self._frame = QPixmap()
+        self._target = QRect()
+
+        # 初始化序列帧
+        self.res_name = res_name
+        self.index = 0  # 当前显示的帧序号
+        self.keyframe_index = 0  # play_keyframe 播放到的源帧序号，即关键帧表的下标
+        self.fps = 30
+        self.rotated_angle = 0.0
+        self._last_paint = 0.0
+        self.is_ready = False
+        self.frame_set: FrameSet | None = None
+        self.use_frame_set(frame_cache.acquire(res_name))
 
         # 初始化循环帧
         self.is_looping = False
@@ -218,14 +723,101 @@ class SequenceFrame(QLabel):
         self.loop_on_show = False
         self.frame_controller = FrameController(fps=self.fps, parent=self)
 
+    @property
+    def frames(self) -> List[QPixmap]:
+        return self.frame_set.frames  # type: ignore
+
+    @property
+    def keyframes(self):
+        return self.frame_set.keyframes  # type: ignore
+
+    @property
+    def load_ms(self) -> int:
+        return self.frame_set.load_ms  # type: ignore
+
+    def use_frame_set(self, frame_set: FrameSet):
+        """切换到另一组序列帧，释放旧的引用"""
+        self.release_frame_set()
+        self.frame_set = frame_set
+        self.is_ready = frame_set.is_ready
+        if frame_set.is_ready:
+            self.show_frame(self.index)
+        else:
+            frame_set.frame_loaded.connect(self._on_frame_loaded)
+            frame_set.ready.connect(self._on_loaded)
+
+    def release_frame_set(self):
+        if self.frame_set is None:
+            return
+        if not self.frame_set.is_ready:
+            self.frame_set.frame_loaded.disconnect(self._on_frame_loaded)
+            self.frame_set.ready.disconnect(self._on_loaded)
+        frame_cache.release(self.frame_set)
+        self.frame_set = None
+
+    def _on_frame_loaded(self, index: int):
+        if index == self.index:
+            self.show_frame(self.index)
+
+    def wait_frame(self):
+        """阻塞到当前帧解码完成并显示，期间只投递已排队的事件，不处理定时器和输入
+        用于跳转等需要立即得到帧尺寸的场合
+        """
+        pool = QThreadPool.globalInstance()
+        while (
+            self._frame.isNull()
+            and self.frame_set is not None
+            and not self.frame_set.loader.cancelled
+        ):
+            pool.waitForDone(5)
+            QCoreApplication.sendPostedEvents()
+
+    def _on_loaded(self):
+        self.is_ready = True
+        self.ready.emit()
+
+    def show_frame(self, index: int):
+        """显示帧，帧尚未解码时跳过"""
+        if self.frame_set.scale != scale:  # type: ignore
+            # 缩放系数改变，换用按新缩放解码的序列帧
+            self.use_frame_set(frame_cache.acquire(self.res_name))
+        frame = self.frames[index]
+        if frame.isNull():
+            return
+        resized = frame.size() != self._frame.size()
+        self._frame = frame
+        if resized:
+            # 只有帧尺寸变化时才影响布局
+            self.updateGeometry()
+        self.update()
+
+    def sizeHint(self) -> QSize:
+        if self._frame.isNull():
+            return super().sizeHint()
+        return self._frame.size()
+
+    def minimumSizeHint(self) -> QSize:
+        # 与 QLabel 一致，不小于帧尺寸
+        return self.sizeHint()
+
+    def resizeEvent(self, event: QResizeEvent):
+        super().resizeEvent(event)
+        self._target = self.rect()
+
     def start_loop(
         self,
         duration: int,
         method: Literal["play_frame", "play_keyframe", "rotate_frame"] = "play_frame",
+        elapsed: float = 0,
     ):
-        """循环播放帧"""
-        callback = getattr(self, method)
-        self.frame_controller.start(callback, step=duration, loop=True)
+        """循环播放帧，elapsed 为循环已播放的时长(ms)，跳转时用于恢复循环的相位"""
+        if method == "play_frame":
+            callback = self.skip_frames
+        elif method == "rotate_frame":
+            callback = self.rotate_steps
+        else:
+            callback = getattr(self, method)
+        self.frame_controller.start(callback, step=duration, loop=True, elapsed=elapsed)
 
     def stop_loop(self):
         """停止循环帧"""
@@ -241,43 +833,76 @@ class SequenceFrame(QLabel):
             self.index = index if index > 0 else len(self.frames) + index
         else:
             raise IndexError("Index out of range for frames.")
-        self.setPixmap(scaled_frame(self.frames[self.index]))
+        self.show_frame(self.index)
 
-    def play_keyframe(self):
-        """从元数据播放关键帧"""
-        assert self.metadata
-        try:
-            self.index += 1
-            next_frame = self.frames[self.frames_index[self.metadata[str(self.index)]]]
-            self.setPixmap(scaled_frame(next_frame))
-        except KeyError:
+    def skip_frames(self, count: int = 1):
+        """向后切换 count 帧，只显示最终的帧"""
+        self.index = (self.index + count) % len(self.frames)
+        self.show_frame(self.index)
+
+    def play_keyframe(self, count: int = 1):
+        """从元数据播放关键帧，向后跳过 count 个源帧"""
+        assert self.keyframes
+        if self.keyframe_index + count >= len(self.keyframes):
             self.stop_loop()
+            return
+        self.keyframe_index += count
+        self.index = self.keyframes[self.keyframe_index]
+        self.show_frame(self.index)
+
+    def rotate_steps(self, count: int = 1):
+        """按默认角度旋转 count 步"""
+        self.rotate_frame(0.5625 * count)
 
     def rotate_frame(self, angle=0.5625):
-        """旋转帧"""
-        pixmap = self.frames[self.index]
-        self.rotated_angle = angle + getattr(self, "rotated_angle", 0)
+        """旋转帧，只记录角度，在 paintEvent 中以变换绘制，不生成新的图像
+        帧还在解码时也累计角度，使旋转与音乐保持同步
+        """
+        self.rotated_angle = (self.rotated_angle + angle) % 360
+        if not self._frame.isNull():
+            self.update()
 
-        transform = QTransform().rotate(self.rotated_angle)
-        rotated = pixmap.transformed(transform, mode=Qt.SmoothTransformation)
+    def reset_rotate(self):
+        """重置旋转状态"""
+        self.rotated_angle = 0.0
+        self.update()
 
-        # 将旋转后的图像绘制回原尺寸画布中居中裁剪
-        result = QPixmap(pixmap.size())
-        result.fill(Qt.transparent)
+    def paintEvent(self, event: QPaintEvent):
+        if not metrics.enabled:
+            self.paint_frame()
+            return
+        start = time.perf_counter()
+        if self.frame_controller.is_running() and self._last_paint:
+            # 循环中相邻两次绘制的间隔，即实际的帧呈现间隔
+            metrics.record("frame.interval", (start - self._last_paint) * 1000)
+        self._last_paint = start
+        self.paint_frame()
+        metrics.record("frame.paint", (time.perf_counter() - start) * 1000)
+        metrics.count("frame.paint")
+
+    def paint_frame(self):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        frame = self._frame
+        if frame.isNull() or frame.hasAlphaChannel() or self.rotated_angle:
+            painter.fillRect(self.rect(), Color.BG_COLOR)
+        if frame.isNull():
+            painter.end()
+            return
 
-        painter = QPainter(result)
-        x = (pixmap.width() - rotated.width()) // 2
-        y = (pixmap.height() - rotated.height()) // 2
-        painter.drawPixmap(x, y, rotated)
+        if self.rotated_angle:
+            # 绕中心旋转绘制，超出部分裁剪，露出的角落为背景色
+            rect = QRectF(self._target)
+            painter.translate(rect.center())
+            painter.rotate(self.rotated_angle)
+            painter.translate(-rect.width() / 2, -rect.height() / 2)
+            painter.drawPixmap(
+                QRectF(0, 0, rect.width(), rect.height()), frame, QRectF(frame.rect())
+            )
+        else:
+            painter.drawPixmap(self._target, frame)
         painter.end()
 
-        self.setPixmap(scaled_frame(result))
-
-    def reset_rotate(self):
-        """重置旋转状态"""
-        self.rotate_frame = 0
-        self.setPixmap(self.frames[self.index])
-
     # 隐藏时停止循环，显示时恢复循环
 
     def showEvent(self, event: QShowEvent):
@@ -292,12 +917,9 @@ class SequenceFrame(QLabel):
             self.stop_loop()
 
     def cleanup(self):
-        """释放资源"""
+        """释放资源，序列帧留在缓存中供之后复用"""
         self.stop_loop()
-        self.frames.clear()
-        self.frames_index.clear()
-        if hasattr(self, "metadata"):
-            self.metadata.clear()
+        self.release_frame_set()
 
 
 class DecorationShape:
@@ -318,13 +940,237 @@ class Decoration:
     fill: bool = True
     rotation: float = 0.0
 
+    @property
+    def radius(self) -> int:
+        """以 position 为中心、包含旋转后图形的正方形的半边长"""
+        return int(self.size // 2 * 1.415 + self.width) + 2
+
+
+# 预渲染的装饰图形，以形状参数和设备像素比为键
+_decoration_pixmaps: dict[tuple, QPixmap] = {}
+
+
+def decoration_pixmap(deco: Decoration, dpr: float = 1.0) -> QPixmap:
+    """取得预渲染的装饰图形，图形中心位于图像中心，边长为 2 * radius"""
+    key = (
+        deco.shape,
+        deco.color.rgba(),
+        deco.size,
+        deco.width,
+        deco.fill,
+        deco.rotation,
+        dpr,
+    )
+    pixmap = _decoration_pixmaps.get(key)
+    if pixmap is not None:
+        return pixmap
+
+    r = deco.radius
+    pixmap = QPixmap(int(2 * r * dpr), int(2 * r * dpr))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.transparent)
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.translate(r, r)
+    if deco.rotation:
+        painter.rotate(deco.rotation)
+
+    pen = QPen(deco.color)
+    pen.setWidth(deco.width)
+    painter.setPen(pen)
+    painter.setBrush(QBrush(deco.color) if deco.fill else Qt.NoBrush)
+
+    s = deco.size // 2
+    if deco.shape == DecorationShape.CIRCLE:
+        painter.drawEllipse(QPoint(0, 0), s, s)
+    elif deco.shape == DecorationShape.RECTANGLE:
+        painter.drawRect(-s, -s, deco.size, deco.size)
+    elif deco.shape == DecorationShape.TRIANGLE:
+        points = QPolygon([QPoint(0, -s), QPoint(-s, s), QPoint(s, s)])
+        painter.drawPolygon(points)
+    painter.end()
+
+    _decoration_pixmaps[key] = pixmap
+    return pixmap
+
+
+@dataclass(frozen=True)
+class TextStyle:
+    """DecoratedLabel 的文字样式，与文字一起决定渲染结果，不需要构建窗口"""
+
+    size: int | None = None  # 字号，为空时使用应用字体
+    family: str | None = None  # 字体族，为空时使用应用字体
+    bold: bool = False
+    letter_spacing: str = "-16px"
+    color: str = Color.FG_COLOR.name()
+    align: Qt.AlignmentFlag = Qt.AlignmentFlag.AlignCenter
+
+    def font(self) -> QFont:
+        font = QFont(self.family) if self.family else QFont()
+        if self.size:
+            font.setPointSize(self.size)
+        font.setBold(self.bold)
+        return font
+
+    def stylesheet(self) -> str:
+        return f"""
+            color: {self.color};
+            background-color: transparent;
+            letter-spacing: {self.letter_spacing};
+            text-align: {ALIGN_MAP[self.align]};
+        """
+
+    def apply(self, label: QLabel):
+        """将样式应用到 QLabel"""
+        label.setAlignment(self.align)
+        label.setStyleSheet(self.stylesheet())
+        if self.size:
+            label.setFont(self.font())
+
+
+@dataclass
+class RenderedText:
+    """渲染好的文字，只包含有像素的部分"""
+
+    pixmap: QPixmap
+    offset: QPointF  # 图像左上角相对排版区域左上角的位置，文字可能超出排版区域
+    size: QSize  # 排版区域大小，即 QLabel 显示这段文字时的 sizeHint
+    rich: bool
+    dpr: float
+
+
+# 渲染好的文字，以 (文字, 样式, 设备像素比) 为键
+_rendered_texts: dict[tuple[str, TextStyle, float], RenderedText] = {}
+
+
+def prerender_text(
+    text: str, style: TextStyle, dpr: float | None = None
+) -> RenderedText:
+    """取得渲染好的文字，未缓存时按 QLabel 的方式离屏排版并渲染一次
+    HTML 解析、排版和字形栅格化都在这里完成，之后显示这段文字只需贴图
+    """
+    if dpr is None:
+        dpr = QApplication.primaryScreen().devicePixelRatio()
+    key = (text, style, dpr)
+    rendered = _rendered_texts.get(key)
+    if rendered is not None:
+        return rendered
+
+    label = QLabel()
+    style.apply(label)
+    label.setText(text)
+    size = label.sizeHint()
+    # 四周留出与排版区域等高的边距，容纳超出排版区域的字形
+    margin = size.height()
+    label.setContentsMargins(margin, margin, margin, margin)
+    label.resize(size.width() + 2 * margin, size.height() + 2 * margin)
+    image = QImage(label.size() * dpr, QImage.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(Qt.transparent)
+    label.render(image)
+    label.deleteLater()
+
+    # 裁掉透明部分
+    bounds = QRegion(QBitmap.fromImage(image.createAlphaMask())).boundingRect()
+    rendered = RenderedText(
+        QPixmap.fromImage(image.copy(bounds)),
+        QPointF(bounds.topLeft()) / dpr - QPointF(margin, margin),
+        size,
+        Qt.mightBeRichText(text),
+        dpr,
+    )
+    _rendered_texts[key] = rendered
+    return rendered
+
+
+class TextLabel(QLabel):
+    def __init__(self, style: TextStyle):
+        """显示文字的标签，文字按 prerender_text 的缓存贴图，切换文字时不再解析和排版
+        字体、对齐和样式表仍设置到 QLabel 上，显示图片时与 QLabel 相同
+        """
+        super().__init__()
+        self._text = ""
+        self._rendered: RenderedText | None = None
+        self.set_text_style(style)
+
+    def set_text_style(self, style: TextStyle):
+        self.text_style = style
+        style.apply(self)
+        self._render()
+
+    def setText(self, text: str):
+        if text == self._text:
+            return
+        self._text = text
+        self._render()
+
+    def text(self) -> str:
+        return self._text
+
+    def _render(self):
+        if self._text:
+            self._rendered = prerender_text(
+                self._text, self.text_style, self.devicePixelRatioF()
+            )
+        else:
+            self._rendered = None
+        self.updateGeometry()
+        self.update()
+
+    def sizeHint(self) -> QSize:
+        if self._rendered is None:
+            return super().sizeHint()
+        return self._rendered.size.grownBy(self.contentsMargins())
+
+    def minimumSizeHint(self) -> QSize:
+        if self._rendered is None:
+            return super().minimumSizeHint()
+        # 与不换行的 QLabel 一致
+        return self.sizeHint()
+
+    def text_origin(self) -> QPointF:
+        """排版区域在标签中的位置，与 QLabel 按对齐方式放置文字的规则相同"""
+        area = QRectF(self.contentsRect())
+        size = self._rendered.size  # type: ignore
+        align = self.text_style.align
+        x, y = area.x(), area.y()
+        if align & Qt.AlignmentFlag.AlignRight:
+            x += area.width() - size.width()
+        elif align & Qt.AlignmentFlag.AlignHCenter:
+            x += (area.width() - size.width()) / 2
+        if align & Qt.AlignmentFlag.AlignBottom:
+            dy = area.height() - size.height()
+        elif align & Qt.AlignmentFlag.AlignVCenter:
+            dy = (area.height() - size.height()) / 2
+        else:
+            dy = 0
+        if self._rendered.rich:  # type: ignore
+            # 富文本放不下时从顶部开始
+            dy = max(dy, 0)
+        return QPointF(x, y + dy)
+
+    def paintEvent(self, event: QPaintEvent):
+        if self._rendered is None:
+            super().paintEvent(event)
+            return
+        if self._rendered.dpr != self.devicePixelRatioF():
+            self._rendered = prerender_text(
+                self._text, self.text_style, self.devicePixelRatioF()
+            )
+        painter = QPainter(self)
+        painter.drawPixmap(
+            self.text_origin() + self._rendered.offset, self._rendered.pixmap
+        )
+        painter.end()
+
 
 class DecoratedLabel(QWidget):
     def __init__(
         self,
         text: str = "",
         text_size: int | None = None,
-        text_font: QFont = QFont(),
+        text_font: QFont | None = None,
         is_bold: bool = False,
         letter_spacing: str = "-16px",
         line_height: str = "1.2em",
@@ -336,35 +1182,33 @@ class DecoratedLabel(QWidget):
         jitter_frequency: int = 1000,
         jitter_offset: int = 0,
         auto_resize: bool = False,
+        style: TextStyle | None = None,
     ):
-        """带有装饰几何图形的标签，几何图形可随机抖动"""
+        """带有装饰几何图形的标签，几何图形可随机抖动
+        文字样式可由 style 给出，此时忽略 text_size 等文字参数
+        """
         super().__init__()
 
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
         # 初始化标签
-        self.label = QLabel()
-        self.label.setAlignment(text_align)
+        if style is None:
+            style = TextStyle(
+                size=text_size,
+                family=text_font.family() if text_font is not None else None,
+                bold=is_bold,
+                letter_spacing=letter_spacing,
+                color=text_color.name(),
+                align=text_align,
+            )
+        self.label = TextLabel(style)
         self.label.setAttribute(Qt.WA_TransparentForMouseEvents)
         self.label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-        self.color = text_color
-        self.letter_spacing = letter_spacing
-        self.label.setStyleSheet(f"""
-            color: {self.color.name()};
-            background-color: transparent;
-            letter-spacing: {self.letter_spacing};
-            text-align: {ALIGN_MAP[text_align]};
-        """)
-
         if pixmap is not None:
             self.label.setPixmap(pixmap)
         else:
             self.label.setText(text)
-            self.text_font = text_font
-            self.text_font.setBold(is_bold)
-            if text_size:
-                self.set_font_size(text_size)
 
         layout = QVBoxLayout(self)
         layout.addWidget(self.label)
@@ -402,6 +1246,7 @@ class DecoratedLabel(QWidget):
         self.jitter_frequency = jitter_frequency
         self.jitter_offset = jitter_offset
         self.jitter_offsets = [QPoint(0, 0) for _ in self.decorations]
+        self.render_decorations()
 
         if self.decorations:
             self.timer.start(self.jitter_frequency)
@@ -409,29 +1254,39 @@ class DecoratedLabel(QWidget):
             self.timer.stop()
         self.update()
 
+    def render_decorations(self):
+        """按当前设备像素比取得装饰图形"""
+        self.decoration_dpr = self.devicePixelRatioF()
+        self.decoration_pixmaps = [
+            decoration_pixmap(deco, self.decoration_dpr) for deco in self.decorations
+        ]
+
+    def decoration_rect(self, index: int) -> QRect:
+        """装饰当前所在的区域"""
+        deco = self.decorations[index]
+        r = deco.radius
+        center = deco.position + self.jitter_offsets[index]
+        return QRect(center.x() - r, center.y() - r, 2 * r, 2 * r)
+
+    @property
+    def text_style(self) -> TextStyle:
+        return self.label.text_style
+
+    def update_style(self, **changes):
+        """修改文字样式，当前文字按新样式重新取得渲染结果"""
+        style = replace(self.text_style, **changes)
+        if style != self.text_style:
+            self.label.set_text_style(style)
+
     def set_font_size(self, size: int):
-        self.text_font.setPointSize(size)
-        self.label.setFont(self.text_font)
+        self.update_style(size=size)
 
     def set_alignment(self, flag: Qt.AlignmentFlag):
-        if self.label.alignment() != flag:
-            self.label.setAlignment(flag)
-            self.update_stylesheet()
+        self.update_style(align=flag)
 
     def set_letter_spacing(self, letter_spacing: str):
         """设置字间距"""
-        if self.letter_spacing != letter_spacing:
-            self.letter_spacing = letter_spacing
-            self.update_stylesheet()
-
-    def update_stylesheet(self):
-        """更新样式表"""
-        self.label.setStyleSheet(f"""
-            color: {self.color.name()};
-            background-color: transparent;
-            letter-spacing: {self.letter_spacing};
-            text-align: {ALIGN_MAP[self.label.alignment()]};
-        """)
+        self.update_style(letter_spacing=letter_spacing)
 
     def update_text(
         self, text: str, resize: bool | None = None, fuck: tuple[int, int] | None = None
@@ -440,7 +1295,7 @@ class DecoratedLabel(QWidget):
             return
         self.label.setText(text)
         if resize if resize is not None else self.auto_resize:
-            print(self.label.text())
+            logger.debug("Resize to text: %s", text)
             self.label.adjustSize()
             self.adjustSize()
             parent: ContainerWindow = self.parentWidget().parentWidget()  # type: ignore
@@ -453,7 +1308,10 @@ class DecoratedLabel(QWidget):
             parent.relocate()
 
     def update_jitter(self):
-        """更新抖动"""
+        """更新抖动，只重绘装饰移动前后的区域"""
+        region = QRegion()
+        for i in range(len(self.decorations)):
+            region += self.decoration_rect(i)
         self.jitter_offsets = [
             QPoint(
                 random.randint(-self.jitter_offset, self.jitter_offset),
@@ -461,39 +1319,24 @@ class DecoratedLabel(QWidget):
             )
             for _ in self.decorations
         ]
-        self.update()
+        for i in range(len(self.decorations)):
+            region += self.decoration_rect(i)
+        self.update(region)
 
     def paintEvent(self, event):
-        """绘制事件，这玩意AI写的，我也看不懂……"""
+        """绘制事件，装饰图形已预渲染，此处只需贴图"""
         super().paintEvent(event)
         if not self.decorations:
             return
+        if self.devicePixelRatioF() != self.decoration_dpr:
+            self.render_decorations()
 
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        for deco, offset in zip(self.decorations, self.jitter_offsets):
-            pos = deco.position + offset
-            painter.save()
-            painter.translate(pos)
-            if deco.rotation:
-                painter.rotate(deco.rotation)
-
-            pen = QPen(deco.color)
-            pen.setWidth(deco.width)
-            painter.setPen(pen)
-            painter.setBrush(QBrush(deco.color) if deco.fill else Qt.NoBrush)
-
-            s = deco.size // 2
-            if deco.shape == DecorationShape.CIRCLE:
-                painter.drawEllipse(QPoint(0, 0), s, s)
-            elif deco.shape == DecorationShape.RECTANGLE:
-                painter.drawRect(-s, -s, deco.size, deco.size)
-            elif deco.shape == DecorationShape.TRIANGLE:
-                points = QPolygon([QPoint(0, -s), QPoint(-s, s), QPoint(s, s)])
-                painter.drawPolygon(points)
-
-            painter.restore()
+        for i, pixmap in enumerate(self.decoration_pixmaps):
+            rect = self.decoration_rect(i)
+            if event.region().intersects(rect):
+                painter.drawPixmap(rect.topLeft(), pixmap)
+        painter.end()
 
 
 class FloatLabel(QLabel):
@@ -512,6 +1355,8 @@ class FloatLabel(QLabel):
 
 
 class ContainerWindow(QMainWindow):
+    seqframe_ready = Signal(str)
+
     def __init__(
         self,
         widget: SequenceFrame | DecoratedLabel | QWidget,
@@ -544,11 +1389,10 @@ class ContainerWindow(QMainWindow):
             self.resize(*scaled(size))
             self.move(*scaled(process_position(position, size)))
 
-        # 初始化晃动
+        # 初始化晃动，隐藏时由 shake_service 跳过
         self.is_shaking = False
         self.current_offset = None
         self.current_interval = None
-        self.shake_on_show = False
 
         if shake:
             self.start_shake()
@@ -556,13 +1400,20 @@ class ContainerWindow(QMainWindow):
         self._lefting = False
 
     def preload_seqframe(self, name: str, constract: bool = True):
+        """预加载序列帧，立即返回，解码完成后发出 seqframe_ready 信号"""
         if self.res_name == name:
-            return
-        widget = SequenceFrame(name) if name != "empty" else QWidget()
+            return self.widget
+        if name == "empty":
+            widget = QWidget()
+        else:
+            widget = SequenceFrame(name)
+            if widget.is_ready:
+                QTimer.singleShot(0, lambda: self.seqframe_ready.emit(name))
+            else:
+                widget.ready.connect(lambda: self.seqframe_ready.emit(name))
         if constract:
             self.load_widget(widget, name)
-        else:
-            return widget
+        return widget
 
     def load_widget(self, widget: SequenceFrame | QWidget, name: str):
         """加载组件，释放旧组件内存"""
@@ -576,16 +1427,24 @@ class ContainerWindow(QMainWindow):
         self._layout.addWidget(widget)
         self.widget = widget
         if name == "empty":
-            print(f"Unloaded {self.res_name}")
+            logger.info("Unloaded %s", self.res_name)
         else:
-            print(f"Loaded {name} for {self.res_name}")
+            logger.info("Loaded %s for %s", name, self.res_name)
         self.res_name = name
 
     def unload_widget(self):
         """卸载组件"""
         self.preload_seqframe("empty")
 
+    def settle_size(self):
+        """立即完成组件尺寸变化引起的布局调整，使位置按窗口的实际尺寸计算
+        否则新组件的尺寸在下一次事件循环才生效，窗口会从旧的左上角向右下扩大
+        """
+        self._layout.activate()
+        self.layout().activate()
+
     def relocate(self):
+        self.settle_size()
         size = self.width(), self.height()
         self.move(*scaled(process_position(self.position, size)))
         self._original_pos = self.pos()
@@ -598,6 +1457,7 @@ class ContainerWindow(QMainWindow):
             return
         self.position = position
 
+        self.settle_size()
         size = self.width(), self.height()
         new_pos = scaled(process_position(position, size))
         if new_pos != self.pos():
@@ -608,14 +1468,16 @@ class ContainerWindow(QMainWindow):
         target_pos: tuple[int | str, int | str],
         duration: int = 200,
         easing: QEasingCurve.Type = QEasingCurve.OutCubic,
+        elapsed: int = 0,
     ):
-        """平滑移动窗口"""
+        """平滑移动窗口，elapsed 为动画已进行的时长(ms)，跳转时用于恢复动画进度"""
         if (
             hasattr(self, "_move_anim")
             and self._move_anim.state() == QPropertyAnimation.Running
         ):
             return
 
+        self.settle_size()
         self._move_anim = QPropertyAnimation(self, b"pos", self)
         self._move_anim.setDuration(duration)
         self._move_anim.setStartValue(self.pos())
@@ -624,39 +1486,33 @@ class ContainerWindow(QMainWindow):
         )
         self._move_anim.setEasingCurve(easing)
         self._move_anim.start()
+        if elapsed:
+            # 超过时长时动画直接结束
+            self._move_anim.setCurrentTime(min(elapsed, duration))
 
     def start_shake(self, offset=1, interval=33):
-        """抖动窗口
+        """抖动窗口，由 shake_service 统一驱动
 
         Args:
             offset (int, optional): 抖动幅度. Defaults to 1.
             interval (int, optional): 抖动频率(ms). Defaults to 33.
         """
-        if not hasattr(self, "timer"):
-            self._original_pos = self.pos()
-            self.timer = QTimer(self)
-        if self.is_shaking and (
-            (offset != self.current_offset) or (interval != self.current_interval)
+        if (
+            self.is_shaking
+            and offset == self.current_offset
+            and interval == self.current_interval
         ):
-            self.stop_shake
+            return
         if not self.is_shaking:
             self._original_pos = self.pos()
-
-            def do_shake():
-                dx = random.randint(-offset, offset)
-                dy = random.randint(-offset, offset)
-                self.move(self._original_pos + QPoint(dx, dy))
-
-            self.current_offset = offset
-            self.current_interval = interval
-
-            self.timer.timeout.connect(do_shake)
-            self.timer.start(interval)
-            self.is_shaking = False
+        self.current_offset = offset
+        self.current_interval = interval
+        self.is_shaking = True
+        shake_service.add(self, offset, interval)
 
     def stop_shake(self):
-        if hasattr(self, "shake_timer") and self.is_shaking:
-            self.timer.stop()
+        if self.is_shaking:
+            shake_service.remove(self)
             self.is_shaking = False
 
     def fancy_left(self):
@@ -688,18 +1544,78 @@ class ContainerWindow(QMainWindow):
         anim1.start()
         self._lefting = True
 
-    # 隐藏时停止循环，显示时恢复循环
 
-    def showEvent(self, event: QShowEvent) -> None:
-        super().showEvent(event)
-        if self.shake_on_show:
-            self.start_shake(self.current_offset, self.current_interval)  # type: ignore
+class ShakeService(QObject):
+    def __init__(self, seed: int | None = None, parent=None):
+        """集中的窗口抖动服务，所有抖动窗口共用一个定时器，每次唤醒一起更新位置
+        每个窗口只登记一次，隐藏的窗口不移动
+        偏移由带种子的 random.Random 每次唤醒逐个生成，不做向量化：
+        程序不依赖 numpy，同时抖动的窗口最多六个，开销在窗口移动而不在随机数
+        """
+        super().__init__(parent)
+        self.windows: dict[ContainerWindow, tuple[int, int]] = {}  # 窗口: (幅度, 间隔)
+        self._due: dict[ContainerWindow, int] = {}
+        self.rng = random.Random(seed)
+        self.interval = 0  # 最短的抖动间隔
+        self._elapsed = QElapsedTimer()
+        self._elapsed.start()
+        self._source: Callable[[], float] = self._elapsed.elapsed
+        self._manual = False
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    def seed(self, seed: int | None):
+        self.rng.seed(seed)
+
+    def set_time_source(
+        self, source: Callable[[], float] | None = None, manual: bool = False
+    ):
+        """设置时间源(ms)，与 FrameClock.set_time_source 相同"""
+        self._source = source or self._elapsed.elapsed
+        self._manual = manual
+        self._due = {window: self._source() for window in self._due}
+        self._update_timer()
+
+    def add(self, window: "ContainerWindow", offset: int, interval: int):
+        """登记窗口，已登记时更新参数"""
+        self.windows[window] = (offset, interval)
+        self._due.setdefault(window, self._source())
+        self._update_timer()
+
+    def remove(self, window: "ContainerWindow"):
+        self.windows.pop(window, None)
+        self._due.pop(window, None)
+        self._update_timer()
+
+    def _update_timer(self):
+        if not self.windows:
+            self.timer.stop()
+            return
+        self.interval = min(interval for _, interval in self.windows.values())
+        if self._manual:
+            self.timer.stop()
+        elif not self.timer.isActive() or self.timer.interval() != self.interval:
+            self.timer.start(self.interval)
+
+    def tick(self):
+        """移动所有到期且可见的窗口，先为它们生成偏移，再依次移动"""
+        # 允许半个定时间隔的误差，避免定时器略早唤醒时跳过一轮
+        now = self._source() + self.interval // 2
+        due = [
+            (window, offset)
+            for window, (offset, interval) in self.windows.items()
+            if self._due[window] <= now and window.isVisible()
+        ]
+        for window, (offset, interval) in self.windows.items():
+            if self._due[window] <= now:
+                self._due[window] = max(self._due[window] + interval, now - interval)
+        randint = self.rng.randint
+        offsets = [(randint(-o, o), randint(-o, o)) for _, o in due]
+        for (window, _), (dx, dy) in zip(due, offsets):
+            window.move(window._original_pos + QPoint(dx, dy))
 
-    def hideEvent(self, event: QHideEvent) -> None:
-        super().hideEvent(event)
-        if self.is_shaking:
-            self.shake_on_show = True
-            self.stop_shake()
+
+shake_service = ShakeService()
 
 
 class RopeWidget(QWidget):
@@ -710,23 +1626,63 @@ class RopeWidget(QWidget):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update)
-        self.timer.start(1000 // 165)
-
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        pen = QPen(QColor("#CDA4AB"), 4)
-        painter.setPen(pen)
+        # 不再定时重绘，只在目标窗口移动或缩放时重绘绳子经过的区域
+        self.pen = QPen(QColor("#CDA4AB"), 4)
+        self.points = self.rope_points()
+        self.target_window.installEventFilter(self)
 
+    def rope_points(self) -> List[QPoint]:
+        """绳子的两端：固定点及窗口上方的三个点"""
         screen_center = QPoint(self.width() // 2, -300)  # 固定点在屏幕外上方
 
         win_geom = self.target_window.geometry()
         p1 = QPoint(win_geom.left() + 64, win_geom.top() - 32)  # 左上角
         p2 = QPoint(win_geom.center().x(), win_geom.top() - 32)  # 中上
         p3 = QPoint(win_geom.right() - 64, win_geom.top() - 32)  # 右上角
+        return [screen_center, p1, p2, p3]
+
+    def rope_region(self, points: List[QPoint], pieces: int = 16) -> QRegion:
+        """绳子覆盖的区域，每段绳子分成若干小段，取各小段的外接矩形"""
+        margin = self.pen.width()
+        region = QRegion()
+        start = points[0]
+        for end in points[1:]:
+            for i in range(pieces):
+                a = start + (end - start) * (i / pieces)
+                b = start + (end - start) * ((i + 1) / pieces)
+                region += (
+                    QRect(a, b).normalized().adjusted(-margin, -margin, margin, margin)
+                )
+        return region
+
+    def track(self):
+        """目标窗口几何变化后，只重绘绳子移动前后经过的区域"""
+        points = self.rope_points()
+        if points == self.points:
+            return
+        region = self.rope_region(self.points) + self.rope_region(points)
+        self.points = points
+        self.update(region)
+
+    def eventFilter(self, watched, event):
+        if watched is self.target_window and event.type() in (
+            QEvent.Move,
+            QEvent.Resize,
+        ):
+            self.track()
+        return super().eventFilter(watched, event)
 
-        for p in [p1, p2, p3]:
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # 固定点随屏幕宽度变化，此时整个窗口都会重绘
+        self.points = self.rope_points()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(self.pen)
+
+        screen_center, *ends = self.points
+        for p in ends:
             painter.drawLine(screen_center, p)
 
 
@@ -756,6 +1712,12 @@ class HangingWindow(QMainWindow):
         super().hideEvent(event)
         self.rope.hide()
 
+    def cleanup(self):
+        """销毁绳子，丢弃窗口前调用，绳子是独立的顶层窗口，不会随窗口销毁"""
+        self.removeEventFilter(self.rope)
+        self.rope.hide()
+        self.rope.deleteLater()
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self._drag_pos = (
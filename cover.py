@@ -1,12 +1,25 @@
-"""视频封面"""
+"""视频封面，离线渲染为图片
 
-from components import *
-from main import Animation
+用法：python cover.py [输出路径，默认 cover.png]
+"""
 
-app = Animation()
-app.yan.preload_seqframe("frames/yan")
-app.zhi.preload_seqframe("frames/zhi")
-app.small_teto1.preload_seqframe("frames/small_teto1")
+import os
+import sys
+
+# 必须在导入 Qt 前设置
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from components import ContainerWindow, DecoratedLabel, frame_cache, get_res  # noqa: E402
+from main import Animation  # noqa: E402
+from render import OfflineRenderer  # noqa: E402
+
+path = sys.argv[1] if len(sys.argv) > 1 else "cover.png"
+
+app = Animation(media=False)
+renderer = OfflineRenderer(app)
+app.yan.preload_seqframe(get_res("frames/yan"))
+app.zhi.preload_seqframe(get_res("frames/zhi"))
+app.small_teto1.preload_seqframe(get_res("frames/small_teto1"))
 text1 = ContainerWindow(
     DecoratedLabel(
         text="<span style='font-size: 320px;'>但是</span>",
@@ -28,5 +41,7 @@ app.small_teto1.show()
 text1.show()
 text2.show()
 
-
-app.exec()
+renderer.advance(0)
+renderer.capture().save(path)
+print(f"Cover saved to {path}")
+frame_cache.clear()
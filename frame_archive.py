@@ -0,0 +1,180 @@
+"""序列帧归档与关键帧元数据
+
+将一个序列帧目录打包为单个文件，避免打包后启动时大量小文件的打开开销。
+
+关键帧元数据以游程记录：runs 为 [关键帧序号, 持续帧数] 列表，关键帧序号即帧文件排序后的序号，
+载入时编译为整数表，表中第 i 项即第 i 个源帧对应的帧序号。
+
+文件结构（小端）：
+    文件头  <4sHHI  魔数 SQFA、版本号、帧数、元数据长度
+    索引    <QIHH   每帧一条：数据偏移、数据长度、宽、高
+    元数据  UTF-8 JSON：帧文件名列表与关键帧映射（即 metadata.json 的内容）
+    帧数据  PNG 原始字节
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import List, NamedTuple
+
+MAGIC = b"SQFA"
+VERSION = 1
+ARCHIVE_SUFFIX = ".sqfa"
+
+HEADER = struct.Struct("<4sHHI")
+ENTRY = struct.Struct("<QIHH")
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class ArchiveEntry(NamedTuple):
+    offset: int
+    size: int
+    width: int
+    height: int
+
+
+def archive_path(res_name: str) -> str:
+    """序列帧目录对应的归档路径"""
+    return res_name.rstrip("/\\") + ARCHIVE_SUFFIX
+
+
+def png_size(data: bytes) -> tuple[int, int]:
+    """从 PNG 的 IHDR 块读取宽高，无需解码"""
+    if data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        raise ValueError("Not a PNG file.")
+    width, height = struct.unpack(">II", data[16:24])
+    return width, height
+
+
+class FrameArchive:
+    def __init__(self, path: str):
+        """只读打开序列帧归档，帧数据通过 mmap 按需读取"""
+        self.path = path
+        self._file = open(path, "rb")
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, meta_size = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a frame archive.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported frame archive version {version}.")
+
+        self.entries: List[ArchiveEntry] = [
+            ArchiveEntry(*ENTRY.unpack_from(self.buffer, HEADER.size + i * ENTRY.size))
+            for i in range(count)
+        ]
+        meta_offset = HEADER.size + count * ENTRY.size
+        meta = json.loads(self.buffer[meta_offset : meta_offset + meta_size])
+        self.names: List[str] = meta["names"]
+        self.metadata: dict | None = meta["metadata"]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def read(self, index: int) -> bytes:
+        """读取一帧的 PNG 数据
+        PySide6 的 QImage.fromData 不接受 mmap 的 memoryview，此处会复制一次压缩数据
+        """
+        if self.buffer.closed:
+            raise ValueError(f"{self.path} is closed.")
+        entry = self.entries[index]
+        return self.buffer[entry.offset : entry.offset + entry.size]
+
+    def close(self):
+        """关闭归档，可重复调用，关闭后不能再读取"""
+        if not self.buffer.closed:
+            self.buffer.close()
+        self._file.close()
+
+
+def keyframe_runs(metadata: dict, frames_index: dict[str, int]) -> dict:
+    """将旧版逐帧映射 {"源帧序号": 文件名} 转换为游程格式，已是游程格式时原样返回
+    旧版映射中缺失的源帧沿用上一个关键帧
+    """
+    if "runs" in metadata:
+        return metadata
+
+    runs: List[List[int]] = []
+    name = None
+    for i in range(max(map(int, metadata)) + 1):
+        name = metadata.get(str(i), name)
+        if name is None:
+            continue
+        keyframe_id = frames_index[name]
+        if runs and runs[-1][0] == keyframe_id:
+            runs[-1][1] += 1
+        else:
+            runs.append([keyframe_id, 1])
+    return {"runs": runs}
+
+
+def compile_keyframes(metadata: dict, frames_index: dict[str, int]) -> array:
+    """将关键帧元数据编译为整数表"""
+    table = array("H")
+    for keyframe_id, hold in keyframe_runs(metadata, frames_index)["runs"]:
+        table.extend([keyframe_id] * hold)
+    return table
+
+
+def sequence_size(res_name: str) -> tuple[int, int]:
+    """估算序列帧的文件大小和解码后的内存占用（字节），只读取文件头，不解码"""
+    path = archive_path(res_name)
+    if os.path.isfile(path):
+        archive = FrameArchive(path)
+        memory = sum(entry.width * entry.height * 4 for entry in archive.entries)
+        archive.close()
+        return os.path.getsize(path), memory
+
+    file_bytes = memory = 0
+    for name in os.listdir(res_name):
+        if name == "metadata.json":
+            continue
+        file_path = os.path.join(res_name, name)
+        file_bytes += os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            width, height = png_size(f.read(24))
+        memory += width * height * 4
+    return file_bytes, memory
+
+
+def pack(res_name: str, path: str | None = None) -> str:
+    """将序列帧目录打包为归档，返回归档路径"""
+    path = path or archive_path(res_name)
+
+    names: List[str] = []
+    blobs: List[bytes] = []
+    metadata = None
+    for name in sorted(os.listdir(res_name)):
+        file_path = os.path.join(res_name, name)
+        if name == "metadata.json":
+            with open(file_path, encoding="utf-8") as f:
+                metadata = json.load(f)
+            continue
+        with open(file_path, "rb") as f:
+            blobs.append(f.read())
+        names.append(name)
+    if not blobs:
+        raise ValueError(f"No frames found in {res_name}")
+    if metadata is not None:
+        metadata = keyframe_runs(metadata, {name: i for i, name in enumerate(names)})
+
+    meta = json.dumps(
+        {"names": names, "metadata": metadata},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    offset = HEADER.size + len(blobs) * ENTRY.size + len(meta)
+    entries = []
+    for blob in blobs:
+        entries.append(ENTRY.pack(offset, len(blob), *png_size(blob)))
+        offset += len(blob)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(blobs), len(meta)))
+        f.writelines(entries)
+        f.write(meta)
+        f.writelines(blobs)
+    return path
@@ -0,0 +1,314 @@
+"""运行时性能统计
+
+所有数据记录在固定大小的直方图和计数器中，未启用时各记录点只做一次布尔判断。
+启用后可显示半透明的 HUD 窗口，并在退出时输出 JSON。
+"""
+
+import bisect
+import json
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QLabel
+
+# 直方图各桶的上界(ms)，最后一个桶收集超出范围的值
+BUCKETS = (
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2,
+    4,
+    6,
+    8,
+    10,
+    12,
+    14,
+    16,
+    17,
+    18,
+    20,
+    25,
+    30,
+    33,
+    34,
+    36,
+    40,
+    50,
+    67,
+    100,
+    150,
+    250,
+    500,
+    1000,
+)
+
+
+class Histogram:
+    def __init__(self, bounds: tuple[float, ...] = BUCKETS):
+        """固定桶的直方图，百分位数取所在桶的上界"""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float, counts: List[int] | None = None) -> float:
+        """第 p 百分位数，counts 为空时使用全部数据"""
+        counts = counts or self.counts
+        total = sum(counts)
+        if not total:
+            return 0.0
+        target = total * p / 100
+        seen = 0
+        for i, n in enumerate(counts):
+            seen += n
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": dict(zip([*map(str, self.bounds), "inf"], self.counts)),
+        }
+
+
+class Metrics:
+    def __init__(self):
+        """全局统计，enabled 为假时调用方应跳过记录"""
+        self.enabled = False
+        self.histograms: dict[str, Histogram] = {}
+        self.counters: dict[str, int] = {}
+
+    def record(self, name: str, value: float):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.record(value)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self) -> dict:
+        return {
+            "histograms": {k: v.to_dict() for k, v in self.histograms.items()},
+            "counters": dict(self.counters),
+            "rss": rss_bytes(),
+        }
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+metrics = Metrics()
+
+
+def rss_bytes() -> int:
+    """当前进程的常驻内存(字节)，取不到时返回 0"""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            return counters.WorkingSetSize
+        return 0
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def process_uptime() -> float:
+    """进程已运行的时间(秒)，取不到时返回 0"""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        creation, exit_, kernel, user, now = (wintypes.FILETIME() for _ in range(5))
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.kernel32.GetProcessTimes(
+            process,
+            ctypes.byref(creation),
+            ctypes.byref(exit_),
+            ctypes.byref(kernel),
+            ctypes.byref(user),
+        ):
+            return 0.0
+        ctypes.windll.kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+
+        def ticks(filetime) -> int:
+            return filetime.dwHighDateTime << 32 | filetime.dwLowDateTime
+
+        return (ticks(now) - ticks(creation)) / 1e7  # 单位为 100ns
+    try:
+        with open("/proc/self/stat") as f:
+            # 进程名可能含空格，从最后一个括号之后开始数
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class StartupTrace:
+    def __init__(self):
+        """启动阶段记录，时间从进程创建时算起，记录各阶段的开始时刻、耗时和结束时的内存
+        finish 之后不再记录
+        """
+        self.origin = time.perf_counter() - process_uptime()
+        self.phases: List[tuple[str, int, float, float, int]] = []
+        self.finished = False
+        self._open: dict[str, tuple[int, float]] = {}
+        self._last_end = self.origin
+
+    def now(self) -> float:
+        """自进程创建以来的时间(ms)"""
+        return (time.perf_counter() - self.origin) * 1000
+
+    def begin(self, name: str):
+        if not self.finished:
+            self._open[name] = (len(self._open), time.perf_counter())
+
+    def end(self, name: str):
+        """结束阶段，未开始或已结束时忽略"""
+        if name not in self._open:
+            return
+        depth, start = self._open.pop(name)
+        end = time.perf_counter()
+        self.phases.append(
+            (
+                name,
+                depth,
+                (start - self.origin) * 1000,
+                (end - start) * 1000,
+                rss_bytes(),
+            )
+        )
+        self._last_end = end
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def mark(self, name: str):
+        """记录从上一阶段结束到现在的阶段，用于无法包裹的部分，如模块导入"""
+        if self.finished:
+            return
+        self._open[name] = (len(self._open), self._last_end)
+        self.end(name)
+
+    def finish(self):
+        """第一帧显示时调用，之后的调用都会被忽略"""
+        self.finished = True
+        self._open.clear()
+
+    def report(self) -> str:
+        """按开始时刻排列的各阶段，嵌套的阶段缩进显示"""
+        lines = [f"{'phase':28} {'at(ms)':>8} {'cost(ms)':>9} {'RSS(MB)':>8}"]
+        for name, depth, at, ms, rss in sorted(self.phases, key=lambda p: p[2]):
+            label = "  " * depth + name
+            lines.append(f"{label:28} {at:8.0f} {ms:9.1f} {rss / 1024 / 1024:8.1f}")
+        lines.append(f"{'total':28} {self.now():8.0f}")
+        return "\n".join(lines)
+
+
+startup = StartupTrace()
+
+
+class HudWindow(QLabel):
+    def __init__(self, interval: int = 500):
+        """半透明的性能 HUD，显示帧率、帧间隔 p50/p99、丢帧、同步校正次数和内存占用
+        帧间隔为循环中序列帧相邻两次绘制的间隔，HUD 只读取统计，需要先启用 metrics
+        """
+        super().__init__()
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet(
+            "color: #F2EFF2; background-color: rgba(0, 0, 0, 160); padding: 6px;"
+        )
+        self.setFont(QFont("Consolas", 11))
+        self.move(8, 8)
+
+        self._last_time = time.perf_counter()
+        self._last_paints = 0
+        self._last_counts: List[int] = []
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(interval)
+        self.refresh()
+
+    def refresh(self):
+        now = time.perf_counter()
+        paints = metrics.counters.get("frame.paint", 0)
+        fps = (paints - self._last_paints) / (now - self._last_time)
+        self._last_time, self._last_paints = now, paints
+
+        # 只统计上次刷新之后的帧间隔
+        histogram = metrics.histograms.get("frame.interval")
+        p50 = p99 = 0.0
+        if histogram is not None:
+            last = self._last_counts or [0] * len(histogram.counts)
+            recent = [a - b for a, b in zip(histogram.counts, last)]
+            self._last_counts = list(histogram.counts)
+            p50, p99 = (
+                histogram.percentile(50, recent),
+                histogram.percentile(99, recent),
+            )
+
+        self.setText(
+            f"paint {fps:5.1f} fps\n"
+            f"frame p50 {p50:5.1f} ms  p99 {p99:5.1f} ms\n"
+            f"dropped {metrics.counters.get('frames.dropped', 0)}  "
+            f"resync {metrics.counters.get('sync.corrections', 0)}\n"
+            f"RSS {rss_bytes() / 1024 / 1024:6.1f} MB"
+        )
+        self.adjustSize()
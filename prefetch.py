@@ -0,0 +1,167 @@
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, List
+
+from components import FrameSet, frame_cache, scaled_bytes
+from frame_archive import sequence_size
+from timeline import Timeline
+
+MB = 1024 * 1024
+
+
+@dataclass
+class PrefetchRequest:
+    """一次预取：在 need_at 时 target 窗口需要 res_name 序列帧"""
+
+    need_at: int
+    target: str
+    res_name: str
+    file_bytes: int
+    memory_bytes: int
+    frame_set: FrameSet | None = None
+
+
+class Prefetcher:
+    def __init__(
+        self,
+        timeline: Timeline,
+        app: Any,
+        lead_time: int = 3000,
+        memory_budget: int = 512 * MB,
+        decode_ms_per_mb: float = 100.0,
+    ):
+        """序列帧预取器，扫描时间轴中的 preload_seqframe，提前在 frame_cache 中解码
+        同时在各窗口第一次用到前 lead_time 构建窗口
+
+        预取开始时间 = 需要时间 - lead_time - 估算解码耗时
+        已预取但尚未用到的序列帧总内存不超过 memory_budget，超出时推迟后续预取
+        working_set 为时间轴中同时载入的序列帧的最大内存占用，可作为 frame_cache 的预算
+
+        Args:
+            timeline (Timeline): 已编译的时间轴
+            app: 动作目标所在对象，即 Animation
+            lead_time (int): 提前量(ms)
+            memory_budget (int): 预取内存上限(字节)
+            decode_ms_per_mb (float): 初始解码速度估计，之后按实测值修正
+        """
+        self.app = app
+        self.lead_time = lead_time
+        self.memory_budget = memory_budget
+        self.decode_ms_per_mb = decode_ms_per_mb
+
+        self.requests: List[PrefetchRequest] = []
+        sizes: dict[str, int] = {}
+        loaded: dict[str, str] = {}  # 各窗口当前载入的序列帧
+        self.working_set = 0
+        for cue in timeline.cues:
+            for action in cue.actions:
+                if action.name == "unload_widget":
+                    loaded.pop(action.target, None)
+                elif action.name == "preload_seqframe":
+                    res_name = action.args[0]
+                    file_bytes, memory_bytes = sequence_size(res_name)
+                    # 帧按显示缩放解码
+                    sizes[res_name] = scaled_bytes(memory_bytes)
+                    loaded[action.target] = res_name
+                    self.requests.append(
+                        PrefetchRequest(
+                            cue.start,
+                            action.target,
+                            res_name,
+                            file_bytes,
+                            sizes[res_name],
+                        )
+                    )
+            # 多个窗口共用的序列帧只占一份内存
+            resident = sum(sizes[res_name] for res_name in set(loaded.values()))
+            self.working_set = max(self.working_set, resident)
+
+        # 各动作目标第一次用到的时间，ta.0 等取顶层属性名
+        first_use: dict[str, int] = {}
+        for cue in timeline.cues:
+            for action in cue.actions:
+                if action.target != "hooks":
+                    first_use.setdefault(action.target.split(".")[0], cue.start)
+        self.builds = sorted((start, name) for name, start in first_use.items())
+        self.next_build = 0
+
+        self.next = 0  # 下一个待预取的请求
+        self.active: List[PrefetchRequest] = []  # 已预取、尚未到需要时间的请求
+        self.held_bytes = 0
+
+    def decode_cost(self, request: PrefetchRequest) -> float:
+        """估算解码耗时(ms)"""
+        return request.file_bytes / MB * self.decode_ms_per_mb
+
+    def update(self, pos: int):
+        """推进播放头，释放已过需要时间的预取并开始新的预取"""
+        for request in [r for r in self.active if r.need_at <= pos]:
+            self._release(request)
+
+        while (
+            self.next_build < len(self.builds)
+            and self.builds[self.next_build][0] - self.lead_time <= pos
+        ):
+            # 访问即构建，已构建的窗口不受影响
+            getattr(self.app, self.builds[self.next_build][1])
+            self.next_build += 1
+
+        while self.next < len(self.requests):
+            request = self.requests[self.next]
+            if request.need_at <= pos:
+                # 已经错过，由时间轴中的 preload_seqframe 直接加载
+                self.next += 1
+                continue
+            if request.need_at - self.lead_time - self.decode_cost(request) > pos:
+                break
+            if (
+                self.active
+                and self.held_bytes + request.memory_bytes > self.memory_budget
+            ):
+                break
+
+            # 持有引用直到需要时间，期间不会被缓存淘汰
+            request.frame_set = frame_cache.acquire(request.res_name)
+            if not request.frame_set.is_ready:
+                request.frame_set.ready.connect(partial(self._on_ready, request))
+            self.active.append(request)
+            self.held_bytes += request.memory_bytes
+            self.next += 1
+
+    def wait(self, pos: int):
+        """阻塞到 pos 之前需要的预取解码完成
+        离线渲染比实时快，预取可能来不及完成，等待后结果与实时播放相同
+        """
+        for request in self.active:
+            if request.need_at <= pos:
+                request.frame_set.wait()  # type: ignore
+
+    def seek(self, pos: int):
+        """跳转后丢弃所有预取，从 pos 之后的请求重新开始"""
+        for request in list(self.active):
+            self._release(request)
+        self.next = 0
+        while (
+            self.next < len(self.requests) and self.requests[self.next].need_at <= pos
+        ):
+            self.next += 1
+        # 跳过的窗口由场景恢复或之后的动作按需构建
+        self.next_build = 0
+        while (
+            self.next_build < len(self.builds)
+            and self.builds[self.next_build][0] <= pos
+        ):
+            self.next_build += 1
+
+    def _release(self, request: PrefetchRequest):
+        self.active.remove(request)
+        self.held_bytes -= request.memory_bytes
+        # 此时 preload_seqframe 已从缓存取得同一组序列帧
+        frame_cache.release(request.frame_set)  # type: ignore
+        request.frame_set = None
+
+    def _on_ready(self, request: PrefetchRequest):
+        """按实测解码耗时修正估计"""
+        if request.file_bytes and request.frame_set is not None:
+            measured = request.frame_set.load_ms / (request.file_bytes / MB)
+            self.decode_ms_per_mb = self.decode_ms_per_mb * 0.7 + measured * 0.3
@@ -0,0 +1,202 @@
+"""离线渲染
+
+在虚拟时钟上运行动画时间轴，把所有可见窗口按位置合成到一张画布上，
+按固定帧率输出 PNG 序列或原始 RGBA 流。
+不需要显示器和音频设备，序列帧在每一帧前都会解码完成，输出与机器快慢无关。
+
+用法：
+    python render.py --out frames_out            # 输出 PNG 序列
+    python render.py --raw - | ffmpeg -f rawvideo -pix_fmt rgba -s 1920x1080 -r 30 -i - out.mp4
+    python render.py --start 23000 --end 30000 --fps 60 --out clip
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# 必须在导入 Qt 前设置
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QAbstractAnimation, QEvent, QObject, QThreadPool  # noqa: E402
+from PySide6.QtGui import QColor, QImage, QPainter  # noqa: E402
+from PySide6.QtWidgets import QWidget  # noqa: E402
+
+import components  # noqa: E402
+from components import (  # noqa: E402
+    RESOLUTION,
+    SequenceFrame,
+    frame_cache,
+    frame_clock,
+    shake_service,
+)
+from main import Animation, create_timeline  # noqa: E402
+from prefetch import Prefetcher  # noqa: E402
+from timeline import seek_scene  # noqa: E402
+
+
+class OfflineRenderer(QObject):
+    def __init__(self, app: Animation, background: QColor = QColor("#000000")):
+        """离线渲染器，接管帧时钟、抖动和属性动画的时间，由 advance 推进
+
+        Args:
+            app (Animation): 动画程序
+            background (QColor): 桌面背景色
+        """
+        super().__init__()
+        self.app = app
+        self.background = background
+        self.position = 0
+        self.size = (
+            int(RESOLUTION[0] * components.scale),
+            int(RESOLUTION[1] * components.scale),
+        )
+
+        # 虚拟时钟
+        frame_clock.set_time_source(lambda: self.position, manual=True)
+        shake_service.set_time_source(lambda: self.position, manual=True)
+        self.animations: dict[QAbstractAnimation, int] = {}  # 动画: 开始时间
+
+        # 记录窗口显示顺序，后显示的窗口在上层
+        self.stack: list[QWidget] = []
+        app.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if (
+            event.type() == QEvent.Show
+            and isinstance(watched, QWidget)
+            and watched.isWindow()
+        ):
+            if watched in self.stack:
+                self.stack.remove(watched)
+            else:
+                # 向后跳转时窗口会被丢弃重建
+                watched.destroyed.connect(lambda: self.stack.remove(watched))
+            self.stack.append(watched)
+        return False
+
+    def advance(self, position: int):
+        """推进虚拟时钟并处理由此产生的事件"""
+        self.position = position
+        self.app.processEvents()
+        frame_clock.tick()
+        shake_service.tick()
+        self.drive_animations()
+        self.wait_frames()
+
+    def drive_animations(self):
+        """按虚拟时间设置属性动画的进度，动画开始时暂停，之后由此处推进
+        跳转恢复的动画已有进度，开始时间按已进行的时长向前推算
+        """
+        for window in self.stack:
+            for anim in window.findChildren(QAbstractAnimation):
+                if anim.state() == QAbstractAnimation.Running:
+                    anim.pause()
+                    self.animations[anim] = self.position - anim.currentTime()
+        for anim, start in list(self.animations.items()):
+            if anim.state() != QAbstractAnimation.Paused:
+                del self.animations[anim]
+                continue
+            # 到达时长时动画自行停止并发出 finished
+            anim.setCurrentTime(min(self.position - start, anim.totalDuration()))
+        self.app.processEvents()
+
+    def wait_frames(self):
+        """等待可见窗口中的序列帧解码完成"""
+        pool = QThreadPool.globalInstance()
+        while any(
+            isinstance(window.widget, SequenceFrame) and not window.widget.is_ready
+            for window in self.stack
+            if window.isVisible() and hasattr(window, "widget")
+        ):
+            pool.waitForDone(10)
+            self.app.processEvents()
+        # 帧到达后的布局调整
+        self.app.processEvents()
+
+    def capture(self) -> QImage:
+        """按窗口位置和透明度合成所有可见窗口"""
+        image = QImage(*self.size, QImage.Format_RGBA8888)
+        image.fill(self.background)
+        painter = QPainter(image)
+        for window in self.stack:
+            if not window.isVisible():
+                continue
+            painter.setOpacity(window.windowOpacity())
+            painter.drawPixmap(window.geometry().topLeft(), window.grab())
+        painter.end()
+        return image
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线渲染动画")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--start", type=int, default=0, help="开始时间(ms)")
+    parser.add_argument("--end", type=int, default=0, help="结束时间(ms)，默认到最后")
+    parser.add_argument("--out", help="PNG 序列输出目录")
+    parser.add_argument("--raw", help="原始 RGBA 流输出文件，- 为标准输出")
+    parser.add_argument("--seed", type=int, default=0, help="抖动随机种子")
+    args = parser.parse_args()
+    if not args.out and not args.raw:
+        parser.error("需要 --out 或 --raw")
+
+    raw = None
+    if args.raw == "-":
+        # 标准输出用于视频流，日志改为输出到标准错误
+        raw = sys.stdout.buffer
+        sys.stdout = sys.stderr
+    elif args.raw:
+        raw = open(args.raw, "wb")
+
+    app = Animation(media=False)
+    renderer = OfflineRenderer(app)
+    shake_service.seed(args.seed)
+    random.seed(args.seed)
+    timeline = create_timeline(
+        app,
+        notify_arsenal=lambda: print("notify_arsenal", file=sys.stderr),
+        notify_thanks=lambda: print("notify_thanks", file=sys.stderr),
+    )
+    prefetcher = Prefetcher(timeline, app)
+    frame_cache.budget = prefetcher.working_set
+    end = args.end or max(cue.end for cue in timeline.cues)
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    if args.start:
+        # 先把虚拟时钟拨到开始位置，恢复的循环从这里按相位计时
+        renderer.position = args.start
+        seek_scene(timeline, app, args.start)
+        prefetcher.seek(args.start)
+
+    start_time = time.perf_counter()
+    frame = 0
+    position = args.start
+    while position < end:
+        prefetcher.wait(position)
+        timeline.update(position)
+        prefetcher.update(position)
+        renderer.advance(position)
+        image = renderer.capture()
+        if args.out:
+            image.save(os.path.join(args.out, f"{frame:06d}.png"))
+        if raw is not None:
+            raw.write(image.constBits())
+        frame += 1
+        position = args.start + frame * 1000 // args.fps
+
+    if raw is not None:
+        raw.close()
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"Rendered {frame} frames ({renderer.size[0]}x{renderer.size[1]}) "
+        f"in {elapsed:.1f} s, {frame / elapsed:.1f} fps",
+        file=sys.stderr,
+    )
+    frame_cache.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,514 @@
+import bisect
+import json
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any, Callable, List
+
+from PySide6.QtCore import QElapsedTimer, QObject, QPoint, Qt, QTimer
+
+from components import (
+    ALIGN_MAP,
+    Color,
+    Decoration,
+    SequenceFrame,
+    TextStyle,
+    get_res,
+    prerender_text,
+)
+from instrument import metrics
+
+# 作用于窗口内组件的动作，其余动作作用于窗口本身
+WIDGET_ACTIONS = {
+    "update_text",
+    "set_text",
+    "set_decorations",
+    "set_font_size",
+    "set_alignment",
+    "start_loop",
+    "play_frame",
+}
+ALIGNMENTS = {name: flag for flag, name in ALIGN_MAP.items()}
+# 修改文字样式的动作及其修改的 TextStyle 字段
+STYLE_ACTIONS = {"set_font_size": "size", "set_alignment": "align"}
+
+
+@dataclass
+class Action:
+    """时间轴动作，args 和 kwargs 已转换为可直接调用的参数"""
+
+    target: str
+    name: str
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass
+class Cue:
+    """时间轴区间，播放头进入时执行 on_enter，离开时执行 on_exit"""
+
+    start: int
+    end: int
+    on_enter: Callable[[], None]
+    on_exit: Callable[[], None] | None = None
+    actions: List[Action] = field(default_factory=list)
+    note: str = ""
+
+
+class Timeline:
+    def __init__(self):
+        """时间轴，区间按开始时间排序，二分查找当前区间，动作只在跨入区间时执行一次"""
+        self.cues: List[Cue] = []
+        self._starts: List[int] = []
+        self.current = -1  # 当前区间序号，-1 表示不在任何区间内
+        self.position = -1
+        # 跳转时推迟恢复的窗口: 恢复函数，之后的区间用到时以当时的位置调用
+        self.deferred: dict[str, Callable[[int], None]] = {}
+
+    def add(
+        self,
+        start: int,
+        end: int,
+        on_enter: Callable[[], None],
+        on_exit: Callable[[], None] | None = None,
+        actions: List[Action] | None = None,
+        note: str = "",
+    ):
+        """添加区间 [start, end)"""
+        index = bisect.bisect_right(self._starts, start)
+        self._starts.insert(index, start)
+        self.cues.insert(index, Cue(start, end, on_enter, on_exit, actions or [], note))
+
+    def cue(self, start: int, end: int):
+        """以装饰器形式添加区间"""
+
+        def decorator(func: Callable[[], None]):
+            self.add(start, end, func)
+            return func
+
+        return decorator
+
+    def find(self, pos: int) -> int:
+        """查找 pos 所在区间的序号，不在任何区间内时返回 -1"""
+        index = bisect.bisect_right(self._starts, pos) - 1
+        if index >= 0 and pos < self.cues[index].end:
+            return index
+        return -1
+
+    def next_boundary(self, pos: int) -> int | None:
+        """pos 之后最近的区间边界(开始或当前区间的结束)，没有时返回 None"""
+        index = bisect.bisect_right(self._starts, pos)
+        boundaries = []
+        if index < len(self._starts):
+            boundaries.append(self._starts[index])
+        if self.current != -1 and self.cues[self.current].end > pos:
+            boundaries.append(self.cues[self.current].end)
+        return min(boundaries, default=None)
+
+    def update(self, pos: int):
+        """推进播放头，向前推进时被跳过的区间也会依次执行"""
+        index = self.find(pos)
+        if index != -1 and index == self.current:
+            self.position = pos
+            return
+
+        self._exit(self.current)
+        if pos > self.position:
+            first = bisect.bisect_right(self._starts, self.position)
+            last = bisect.bisect_right(self._starts, pos)
+            for skipped in range(first, last):
+                if skipped != index:
+                    self._restore(self.cues[skipped], pos)
+                    self.cues[skipped].on_enter()
+                    self._exit(skipped)
+
+        self.current = index
+        self.position = pos
+        if index != -1:
+            self._restore(self.cues[index], pos)
+            self.cues[index].on_enter()
+
+    def seek(self, pos: int, entered: bool = False):
+        """跳转播放头，不执行跳过的区间，下次 update 时进入 pos 所在区间
+        entered 为真时视为已进入 pos 所在区间，用于场景已由 seek_scene 恢复的情况
+        """
+        self._exit(self.current)
+        self.deferred.clear()
+        if entered:
+            self.current = self.find(pos)
+            self.position = pos
+        else:
+            self.current = -1
+            self.position = pos - 1
+
+    def _restore(self, cue: Cue, pos: int):
+        """区间用到推迟恢复的窗口时，先恢复它的状态"""
+        if not self.deferred:
+            return
+        for action in cue.actions:
+            restore = self.deferred.pop(top_level(action.target), None)
+            if restore is not None:
+                restore(pos)
+
+    def _exit(self, index: int):
+        if index != -1 and self.cues[index].on_exit is not None:
+            self.cues[index].on_exit()  # type: ignore
+
+
+class CueDispatcher(QObject):
+    def __init__(self, timeline: Timeline, max_lead: int = 250, parent=None):
+        """区间调度器，在两次媒体位置上报之间用单调时钟插值播放位置，
+        并定时到下一个区间边界，使短区间不受 positionChanged 上报间隔的影响
+
+        Args:
+            timeline (Timeline): 时间轴
+            max_lead (int): 插值最多超前上次上报的位置(ms)，媒体卡顿时不会一直向前
+        """
+        super().__init__(parent)
+        self.timeline = timeline
+        self.max_lead = max_lead
+        self._elapsed = QElapsedTimer()
+        self._sample: tuple[int, float] | None = None  # 上报的位置, 上报时的时钟时间
+        self._boundary: int | None = None  # 定时等待的边界
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.dispatch)
+
+    def now(self) -> float:
+        """插值后的媒体位置(ms)"""
+        if self._sample is None:
+            return self.timeline.position
+        pos, stamp = self._sample
+        lead = self._elapsed.nsecsElapsed() / 1e6 - stamp
+        return pos + min(max(lead, 0.0), self.max_lead)
+
+    def update(self, pos: int):
+        """传入媒体播放位置(ms)，一般连接到 positionChanged"""
+        if not self._elapsed.isValid():
+            self._elapsed.start()
+        self._sample = (pos, self._elapsed.nsecsElapsed() / 1e6)
+        self.dispatch()
+
+    def stop(self):
+        """停止调度，播放暂停或结束时调用"""
+        self._timer.stop()
+        self._sample = None
+        self._boundary = None
+
+    def dispatch(self):
+        """推进时间轴到插值位置，然后定时到下一个边界"""
+        pos = int(self.now())
+        # 插值位置可能超前于之后上报的位置，播放头只向前推进
+        if pos > self.timeline.position:
+            if metrics.enabled and self._boundary is not None and pos >= self._boundary:
+                metrics.record("cue.lateness", pos - self._boundary)
+            self.timeline.update(pos)
+
+        self._boundary = self.timeline.next_boundary(self.timeline.position)
+        if self._boundary is None or self._sample is None:
+            self._timer.stop()
+            return
+        if self._boundary > self._sample[0] + self.max_lead:
+            # 超出插值范围，下一次位置上报时再定时
+            self._timer.stop()
+            return
+        delay = self._boundary - self.now()
+        self._timer.start(max(0, int(delay + 0.999)))
+
+
+# 场景状态中各动作所属的键，同一键只保留最后的状态，未列出的动作以动作名为键
+# 窗口随文字变大后不会缩小，文字和样式按顺序全部保留，使窗口尺寸与播放时相同
+SCENE_KEYS = {
+    "show": "visible",
+    "hide": "visible",
+    "close": "visible",
+    "preload_seqframe": "widget",
+    "unload_widget": "widget",
+    "move_to": "geometry",
+    "smooth_move_to": "geometry",
+    "relocate": "geometry",
+    "adjustSize": "geometry",
+    "fancy_left": "geometry",
+    "start_shake": "shake",
+    "stop_shake": "shake",
+    "start_loop": "loop",
+    "play_frame": "loop",
+    "update_text": "text",
+    "set_text": "text",
+    "set_font_size": "text",
+    "set_alignment": "text",
+}
+# 按顺序累积全部动作的键，其余键只保留最后一个动作
+HISTORY_KEYS = {"geometry", "text"}
+# 持续一段时间的动作，跳转时按所在区间开始后经过的时长恢复进度
+TIMED_ACTIONS = {"start_loop", "smooth_move_to"}
+
+# 场景状态，(目标, 键): [(动作序号, 所在区间的开始时间, 动作)]
+Scene = dict[tuple[str, str], List[tuple[int, int, Action]]]
+
+
+def scene_at(timeline: Timeline, pos: int) -> Scene:
+    """按顺序折叠开始时间不晚于 pos 的区间的动作，得到 pos 时的场景状态
+
+    位置依赖组件尺寸和之前 move_to 设置的 position，geometry 保留最后一次 move_to
+    和更换组件之后的全部位置动作，text 保留全部文字和样式动作；
+    更换组件后旧组件上的循环失效。
+    """
+    scene: Scene = {}
+    last_move: dict[str, tuple[int, int, Action]] = {}
+    order = 0
+    for cue in timeline.cues:
+        if cue.start > pos:
+            break
+        for action in cue.actions:
+            order += 1
+            if action.target == "hooks":
+                continue
+            target = action.target
+            key = SCENE_KEYS.get(action.name, action.name)
+            entry = (order, cue.start, action)
+            if key == "widget":
+                scene.pop((target, "loop"), None)
+                geometry = [last_move[target]] if target in last_move else []
+                scene[(target, "geometry")] = geometry
+            elif key in HISTORY_KEYS:
+                if action.name == "move_to":
+                    last_move[target] = entry
+                scene.setdefault((target, key), []).append(entry)
+                continue
+            scene[(target, key)] = [entry]
+    return {key: value for key, value in scene.items() if value}
+
+
+def scene_diff(current: Scene, target: Scene) -> List[tuple[int, Action]]:
+    """从 current 变为 target 需要执行的动作及其所在区间的开始时间，按原本的顺序排列
+    累积的动作已执行了开头的一部分时只执行其余部分
+    只适用于向前变化，current 中有而 target 中没有的状态不会被还原
+    """
+    changes = []
+    for key, entries in target.items():
+        done = current.get(key, [])
+        if entries[: len(done)] == done:
+            changes.extend(entries[len(done) :])
+        else:
+            changes.extend(entries)
+    changes.sort(key=lambda change: change[0])
+    return [(start, action) for _, start, action in changes]
+
+
+def top_level(target: str) -> str:
+    """目标所属的 Animation 属性名，ta.0 属于 ta"""
+    return target.split(".")[0]
+
+
+def scene_hidden(scene: Scene, name: str) -> bool:
+    """name 下的全部目标在场景中都已隐藏，或从未显示且已卸载组件"""
+    targets = {key[0] for key in scene if top_level(key[0]) == name}
+    for target in targets:
+        visible = scene.get((target, "visible"))
+        if visible:
+            if visible[-1][2].name not in ("hide", "close"):
+                return False
+            continue
+        widget = scene.get((target, "widget"))
+        if not widget or widget[-1][2].name != "unload_widget":
+            return False
+    return True
+
+
+def apply_scene(app: Any, actions: List[tuple[int, Action]], pos: int):
+    """按顺序执行场景动作，持续的动作按 pos 时已经过的时长恢复进度
+    显示和位置依赖组件尺寸，预加载之后的其他动作执行前先等待序列帧解码出当前帧
+    """
+    loading: List[SequenceFrame] = []
+    for start, action in actions:
+        if loading and SCENE_KEYS.get(action.name) != "widget":
+            for widget in loading:
+                widget.wait_frame()
+            loading.clear()
+        if action.name in TIMED_ACTIONS:
+            action = replace(action, kwargs={**action.kwargs, "elapsed": pos - start})
+        compile_action(action, app, {})()
+        if action.name == "preload_seqframe":
+            widget = resolve_target(app, action.target).widget
+            if isinstance(widget, SequenceFrame) and not widget.is_ready:
+                loading.append(widget)
+
+
+def seek_scene(timeline: Timeline, app: Any, pos: int) -> int:
+    """跳转到 pos 并恢复当时的场景，只执行与当前场景不同的部分，返回执行的动作数
+
+    只为最终用到的组件载入资源，被之后的动作覆盖的中间状态不会执行。
+    pos 时已隐藏且尚未构建的窗口不构建，之后的区间用到时再由时间轴恢复。
+    循环和平滑移动按所在区间开始后经过的时长恢复进度，调用前帧时钟应已对应 pos。
+    向后跳转时，状态与 pos 时不同的窗口由 app.reset 丢弃，
+    之后按需重新构建为初始状态，再执行 pos 时它的全部状态。
+    """
+    current = scene_at(timeline, timeline.position)
+    target = scene_at(timeline, pos)
+    # 推迟恢复的窗口尚未构建，仍是初始状态
+    unapplied = set(timeline.deferred)
+    if pos < timeline.position:
+        # ta.0 等目标按顶层属性整体重建
+        stale = {
+            top_level(key[0])
+            for key in current.keys() | target.keys()
+            if current.get(key) != target.get(key)
+        }
+        for name in stale:
+            app.reset(name)
+        unapplied |= stale
+    current = {
+        key: entries
+        for key, entries in current.items()
+        if top_level(key[0]) not in unapplied
+    }
+
+    # 已隐藏且尚未构建的窗口，Animation 构建过的窗口保存为实例属性
+    hidden = {
+        name
+        for name in {top_level(key[0]) for key in target}
+        if name not in vars(app) and scene_hidden(target, name)
+    }
+    deferred: dict[str, Scene] = {name: {} for name in hidden}
+    for key in list(target):
+        if top_level(key[0]) in hidden:
+            deferred[top_level(key[0])][key] = target.pop(key)
+
+    actions = scene_diff(current, target)
+    apply_scene(app, actions, pos)
+    timeline.seek(pos, entered=True)
+    timeline.deferred = {
+        name: partial(apply_scene, app, scene_diff({}, scene))
+        for name, scene in deferred.items()
+    }
+    return len(actions)
+
+
+def parse_decoration(data: dict) -> Decoration:
+    """解析装饰，position 为 [x, y]，color 为 Color 中的颜色名"""
+    kwargs = dict(data)
+    kwargs["position"] = QPoint(*data["position"])
+    if "color" in data:
+        kwargs["color"] = getattr(Color, data["color"])
+    return Decoration(**kwargs)
+
+
+def parse_args(name: str, args: list, kwargs: dict) -> tuple[tuple, dict]:
+    """将时间轴文件中的参数转换为动作参数"""
+    if name == "preload_seqframe":
+        args = [get_res(args[0]), *args[1:]]
+    elif name == "set_decorations":
+        args = [[parse_decoration(deco) for deco in args[0]], *args[1:]]
+    elif name == "set_alignment":
+        args = [ALIGNMENTS[args[0]]]
+    elif name in ("move_to", "smooth_move_to"):
+        args = [tuple(args[0]), *args[1:]]
+    if "fuck" in kwargs:
+        kwargs = {**kwargs, "fuck": tuple(kwargs["fuck"])}
+    return tuple(args), kwargs
+
+
+def parse_action(entry: list) -> Action:
+    """解析动作 [目标, 动作, *参数, {关键字参数}]"""
+    target, name, *args = entry
+    kwargs = args.pop() if args and isinstance(args[-1], dict) else {}
+    args, kwargs = parse_args(name, args, kwargs)
+    return Action(target, name, args, kwargs)
+
+
+def resolve_target(app: Any, target: str):
+    """解析动作目标，ta.0 表示 app.ta[0]"""
+    obj = app
+    for part in target.split("."):
+        obj = obj[int(part)] if part.isdigit() else getattr(obj, part)
+    return obj
+
+
+def compile_action(
+    action: Action, app: Any, hooks: dict[str, Callable[[], None]]
+) -> Callable[[], None]:
+    """将动作编译为无参函数，目标在执行时再解析
+    窗口在第一次用到时才构建，组件也会随预加载替换
+    """
+    target, name, args, kwargs = action.target, action.name, action.args, action.kwargs
+    if target == "hooks":
+        return hooks[name]
+
+    if name == "set_text":
+        return lambda: resolve_target(app, target).widget.label.setText(*args)
+    if name in WIDGET_ACTIONS:
+        return lambda: getattr(resolve_target(app, target).widget, name)(
+            *args, **kwargs
+        )
+    return lambda: getattr(resolve_target(app, target), name)(*args, **kwargs)
+
+
+def compile_cue(
+    actions: List[Action], app: Any, hooks: dict[str, Callable[[], None]]
+) -> Callable[[], None]:
+    compiled = [compile_action(action, app, hooks) for action in actions]
+
+    def on_enter():
+        for func in compiled:
+            func()
+
+    return on_enter
+
+
+def collect_texts(
+    timeline: Timeline, styles: dict[str, TextStyle]
+) -> List[tuple[str, str, TextStyle]]:
+    """按时间顺序模拟修改文字样式的动作，收集各文字组件将要显示的文字及当时的样式
+    styles 为各文字组件的初始样式，不在其中的目标会被跳过，不需要构建窗口
+    """
+    styles = dict(styles)
+    texts = []
+    for cue in timeline.cues:
+        for action in cue.actions:
+            style = styles.get(action.target)
+            if style is None:
+                continue
+            if action.name in STYLE_ACTIONS:
+                styles[action.target] = replace(
+                    style, **{STYLE_ACTIONS[action.name]: action.args[0]}
+                )
+            elif action.name in ("update_text", "set_text") and action.args[0]:
+                texts.append((action.target, action.args[0], style))
+    return texts
+
+
+def prewarm_texts(timeline: Timeline, styles: dict[str, TextStyle]) -> int:
+    """启动时渲染时间轴中的全部文字并缓存，显示时直接贴图，返回渲染的数量"""
+    texts = collect_texts(timeline, styles)
+    for _, text, style in texts:
+        prerender_text(text, style)
+    return len(texts)
+
+
+def load_timeline(
+    path: str, app: Any, hooks: dict[str, Callable[[], None]] | None = None
+) -> Timeline:
+    """从时间轴文件载入并编译时间轴
+
+    时间轴文件为 JSON，cues 中每项为一个区间：
+        start, end: 区间 [start, end)，单位毫秒
+        note: 备注，可省略
+        actions: 动作列表，每个动作为 [目标, 动作, *参数, {关键字参数}]
+            目标为 Animation 的属性名，ta.0 表示 ta[0]，hooks 表示调用 hooks 中的函数
+    """
+    hooks = hooks or {}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    timeline = Timeline()
+    for cue in data["cues"]:
+        actions = [parse_action(entry) for entry in cue["actions"]]
+        timeline.add(
+            cue["start"],
+            cue["end"],
+            compile_cue(actions, app, hooks),
+            actions=actions,
+            note=cue.get("note", ""),
+        )
+    return timeline
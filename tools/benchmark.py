@@ -0,0 +1,292 @@
+"""渲染热点的微基准测试
+
+在 offscreen 平台下测量序列帧载入、逐帧播放、装饰绘制、文字更新和位置计算的耗时，
+结果输出为 JSON，默认与 tools/benchmark_baseline.json 对比，超出阈值时以非零状态退出。
+每项取多轮的中位数并记录轮间波动，只有变化同时超过阈值加两边的波动、
+且单次耗时的差超过噪声下限(µs)时才算退化，避免亚毫秒的项因噪声误报。
+基准与机器有关，换机器后必须先用 --save-baseline 重新保存。
+
+用法：
+    python tools/benchmark.py                                 # 运行并与基准对比
+    python tools/benchmark.py --output result.json            # 保存结果
+    python tools/benchmark.py --save-baseline                 # 保存为基准
+    python tools/benchmark.py --baseline old.json --threshold 0.2 --noise-floor 20
+    python tools/benchmark.py --baseline ""                   # 不对比，打印结果
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PySide6  # noqa: E402
+from PySide6.QtCore import QPoint, QThreadPool  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from components import (  # noqa: E402
+    DecoratedLabel,
+    Decoration,
+    DecorationShape,
+    SequenceFrame,
+    frame_cache,
+    get_res,
+    process_position,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+DEFAULT_SEQUENCES = ["yan", "small_teto1", "img1", "teto1"]
+
+
+def measure(func: Callable[[], None], number: int, repeat: int) -> list[float]:
+    """重复 repeat 轮，每轮调用 number 次，返回每轮的单次耗时(ms)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) * 1000 / number)
+    return times
+
+
+def result(times: list[float], unit: str = "ms", scale: float = 1) -> dict:
+    """由每轮耗时(ms)生成结果，value 为中位数乘以 scale，
+    spread 为中间一半的轮次的相对波动，unit 为 ops/s 时取倒数，越高越好
+    """
+    median = statistics.median(times)
+    quartiles = statistics.quantiles(times, n=4) if len(times) > 1 else [median] * 3
+    spread = (quartiles[2] - quartiles[0]) / median if median else 0
+    if unit == "ops/s":
+        value, better = 1000 / median, "higher"
+    else:
+        value, better = median * scale, "lower"
+    return {
+        "value": round(value, 4),
+        "unit": unit,
+        "better": better,
+        "spread": round(spread, 4),
+    }
+
+
+def op_us(entry: dict) -> float:
+    """单次耗时(µs)"""
+    value = entry["value"]
+    if entry["unit"] == "ops/s":
+        return 1e6 / value
+    return value * {"ms": 1000, "us": 1}[entry["unit"]]
+
+
+def load_sequence(app: QApplication, name: str) -> SequenceFrame:
+    """不经缓存载入序列帧并等待解码完成"""
+    frame_cache.clear()
+    widget = SequenceFrame(get_res(f"frames/{name}"))
+    pool = QThreadPool.globalInstance()
+    while not widget.is_ready:
+        pool.waitForDone(5)
+        app.processEvents()
+    return widget
+
+
+def bench_load(app: QApplication, sequences: list[str], repeat: int) -> dict:
+    results = {}
+    for name in sequences:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            widget = load_sequence(app, name)
+            times.append((time.perf_counter() - start) * 1000)
+            widget.cleanup()
+            widget.deleteLater()
+        results[f"load.{name}"] = result(times)
+    return results
+
+
+def bench_playback(app: QApplication, repeat: int) -> dict:
+    """每次调用后立即重绘，计入实际的绘制开销"""
+    results = {}
+
+    widget = load_sequence(app, "small_teto1")
+    widget.resize(620, 600)
+    widget.show()
+    app.processEvents()
+
+    def play_frame():
+        widget.play_frame()
+        widget.repaint()
+
+    results["play_frame"] = result(measure(play_frame, 200, repeat), "ops/s")
+
+    def rotate_frame():
+        widget.rotate_frame()
+        widget.repaint()
+
+    results["rotate_frame"] = result(measure(rotate_frame, 200, repeat), "ops/s")
+    widget.reset_rotate()
+    widget.cleanup()
+    widget.deleteLater()
+
+    widget = load_sequence(app, "teto1")
+    widget.resize(950, 900)
+    widget.show()
+    app.processEvents()
+
+    def play_keyframe():
+        if widget.keyframe_index + 1 >= len(widget.keyframes):
+            widget.keyframe_index = 0
+        widget.play_keyframe()
+        widget.repaint()
+
+    results["play_keyframe"] = result(measure(play_keyframe, 200, repeat), "ops/s")
+    widget.cleanup()
+    widget.deleteLater()
+    return results
+
+
+def bench_decorated(app: QApplication, repeat: int) -> dict:
+    results = {}
+    label = DecoratedLabel(
+        text_size=200,
+        decorations=[
+            Decoration(QPoint(240, 440), DecorationShape.CIRCLE, size=400),
+            Decoration(QPoint(240, 440), DecorationShape.CIRCLE, size=200),
+            Decoration(QPoint(600, 200), DecorationShape.RECTANGLE, size=160),
+            Decoration(QPoint(700, 700), size=130, rotation=15),
+        ],
+        jitter_offset=8,
+    )
+    label.timer.stop()
+    label.resize(890, 900)
+    label.show()
+    app.processEvents()
+
+    results["decorated.paint"] = result(measure(label.repaint, 50, repeat))
+
+    def jitter():
+        label.update_jitter()
+        app.processEvents()
+
+    results["decorated.jitter"] = result(measure(jitter, 50, repeat))
+
+    texts = [
+        "<span style='font-size:560px;'>え</span><span style='font-size:200px;'>？</span><br>——",
+        "<span style='font-size:560px;'>え</span><span style='font-size:200px;'>？</span><br>うそ",
+    ]
+    state = {"i": 0}
+
+    def update_text():
+        state["i"] ^= 1
+        label.update_text(texts[state["i"]])
+        label.repaint()
+
+    results["update_text"] = result(measure(update_text, 20, repeat))
+    label.deleteLater()
+    return results
+
+
+def bench_position(repeat: int) -> dict:
+    positions = [("mid", "mid"), ("gapL160", "mid"), ("gapR32", 120), (100, 200)]
+
+    def run():
+        for position in positions:
+            process_position(position, (450, 450))
+
+    times = measure(run, 2000, repeat)
+    return {"process_position": result(times, "us", 1000 / len(positions))}
+
+
+def run(sequences: list[str], repeat: int) -> dict:
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {}
+    results.update(bench_load(app, sequences, repeat))
+    results.update(bench_playback(app, repeat))
+    results.update(bench_decorated(app, repeat))
+    results.update(bench_position(repeat))
+    frame_cache.clear()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pyside6": PySide6.__version__,
+            "platform": platform.platform(),
+            "qpa": os.environ["QT_QPA_PLATFORM"],
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    data: dict, baseline: dict, threshold: float, noise_floor: float
+) -> list[str]:
+    """与基准对比，返回退化超过阈值加两边波动、且单次耗时增加超过 noise_floor(µs) 的项"""
+    regressions = []
+    for name, current in data["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["value"]:
+            continue
+        change = op_us(current) / op_us(base) - 1
+        allowed = threshold + current.get("spread", 0) + base.get("spread", 0)
+        mark = ""
+        if change > allowed and op_us(current) - op_us(base) > noise_floor:
+            mark = "  REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:24} {base['value']:>12.3f} -> {current['value']:>12.3f} "
+            f"{current['unit']:6} {change:+7.1%} (allowed {allowed:.0%}){mark}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="渲染热点微基准测试")
+    parser.add_argument("--sequences", nargs="*", default=DEFAULT_SEQUENCES)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", help="结果 JSON 输出路径")
+    parser.add_argument(
+        "--baseline",
+        default=DEFAULT_BASELINE,
+        help="对比的基准 JSON，默认为 tools/benchmark_baseline.json，为空时不对比",
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="保存为基准")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="在两边的轮间波动之外允许的退化比例，默认 0.15",
+    )
+    parser.add_argument(
+        "--noise-floor",
+        type=float,
+        default=10,
+        help="单次耗时增加不超过此值(µs)时不算退化，默认 10",
+    )
+    args = parser.parse_args()
+
+    data = run(args.sequences, args.repeat)
+    output = json.dumps(data, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Baseline saved to {DEFAULT_BASELINE}")
+
+    if args.baseline and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(data, baseline, args.threshold, args.noise_floor)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+    elif not args.output and not args.save_baseline:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
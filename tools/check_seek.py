@@ -0,0 +1,144 @@
+"""跳转一致性检查
+
+用 render.py 的离线渲染器在虚拟时钟上从头播放时间轴，记录各检查位置所有可见窗口的
+geometry，再对每个位置在新的进程中直接跳转，与 render.py --start 相同，
+比较两者，有差异时以非零状态退出。
+平滑移动进行中的位置起点取决于更换组件前的窗口大小，跳转后可能相差几个像素，
+默认位置避开了这些区间。
+
+用法：
+    python tools/check_seek.py                              # 检查默认位置
+    python tools/check_seek.py --positions 47000 69000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_POSITIONS = [
+    24000,
+    30000,
+    36000,
+    47000,
+    60000,
+    69000,
+    95000,
+    115000,
+    122000,
+    140000,
+    150000,
+]
+
+
+def snapshot(app) -> dict[str, list[int]]:
+    """所有可见窗口的 geometry，列表中的窗口以 ta.0 的形式命名
+    抖动的偏移是随机的，抖动中的窗口取抖动的中心位置
+    """
+    from PySide6.QtWidgets import QWidget
+
+    windows = {}
+    for name, obj in sorted(vars(app).items()):
+        items = enumerate(obj) if isinstance(obj, list) else [(None, obj)]
+        for i, window in items:
+            if isinstance(window, QWidget) and window.isWindow() and window.isVisible():
+                rect = window.geometry()
+                if getattr(window, "is_shaking", False):
+                    rect.moveTopLeft(window._original_pos)
+                key = name if i is None else f"{name}.{i}"
+                windows[key] = [rect.x(), rect.y(), rect.width(), rect.height()]
+    return windows
+
+
+def record(mode: str, positions: list[int], fps: int) -> dict[int, dict]:
+    """play 为从头播放到各位置，seek 为直接跳转到唯一的位置"""
+    from components import frame_cache
+    from main import Animation, create_timeline
+    from prefetch import Prefetcher
+    from render import OfflineRenderer
+    from timeline import seek_scene
+
+    app = Animation(media=False)
+    renderer = OfflineRenderer(app)
+    timeline = create_timeline(
+        app, notify_arsenal=lambda: None, notify_thanks=lambda: None
+    )
+    prefetcher = Prefetcher(timeline, app)
+    frame_cache.budget = prefetcher.working_set
+
+    snapshots = {}
+    if mode == "seek":
+        (position,) = positions
+        renderer.position = position
+        seek_scene(timeline, app, position)
+        prefetcher.seek(position)
+        renderer.advance(position)
+        snapshots[position] = snapshot(app)
+    else:
+        frame = 0
+        for target in sorted(positions):
+            while (position := frame * 1000 // fps) < target:
+                prefetcher.wait(position)
+                timeline.update(position)
+                prefetcher.update(position)
+                renderer.advance(position)
+                frame += 1
+            prefetcher.wait(target)
+            timeline.update(target)
+            prefetcher.update(target)
+            renderer.advance(target)
+            snapshots[target] = snapshot(app)
+    frame_cache.clear()
+    return snapshots
+
+
+def run(mode: str, positions: list[int], fps: int) -> dict[int, dict]:
+    """在新的进程中记录，每个进程只能创建一次 Animation"""
+    args = [sys.executable, __file__, "--record", mode, "--fps", str(fps)]
+    output = subprocess.run(
+        [*args, "--positions", *map(str, positions)],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout
+    return {int(pos): windows for pos, windows in json.loads(output).items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查跳转后的窗口位置与播放时是否一致")
+    parser.add_argument("--positions", type=int, nargs="*", default=DEFAULT_POSITIONS)
+    parser.add_argument("--fps", type=int, default=30, help="播放时的帧率")
+    parser.add_argument("--record", choices=["play", "seek"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.record:
+        # 子进程：结果输出到标准输出，日志改为输出到标准错误
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        snapshots = record(args.record, args.positions, args.fps)
+        stdout.write(json.dumps(snapshots))
+        return
+
+    played = run("play", args.positions, args.fps)
+    mismatches = 0
+    for position in sorted(args.positions):
+        seeked = run("seek", [position], args.fps)[position]
+        expected = played[position]
+        for name in sorted(expected.keys() | seeked.keys()):
+            if expected.get(name) != seeked.get(name):
+                mismatches += 1
+                print(
+                    f"{position:>7} {name:16} play {expected.get(name)} "
+                    f"seek {seeked.get(name)}"
+                )
+        print(f"{position:>7} {len(expected)} windows checked")
+
+    if mismatches:
+        print(f"{mismatches} mismatch(es)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
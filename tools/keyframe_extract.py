@@ -47,7 +47,10 @@ class KeyframeWorker(QThread):
                 self.finished.emit(False)
                 return
 
-            meta, last_img, last_hash, last_name = {}, None, None, None
+            # 关键帧元数据以游程记录：runs 为 [关键帧序号, 持续帧数]
+            # 第一个关键帧之前无法读取的帧计入第一个关键帧，使总帧数与源帧一致
+            keyframe_count, runs, last_img, last_hash = 0, [], None, None
+            leading = 0
             for i, fname in enumerate(files):
                 if not self._running:
                     self.finished.emit(False)
@@ -56,6 +59,10 @@ class KeyframeWorker(QThread):
                 img = cv2.imread(path)
                 if img is None:
                     self.message.emit(f"跳过：{fname}")
+                    if runs:
+                        runs[-1][1] += 1
+                    else:
+                        leading += 1
                     continue
 
                 pil = Image.fromarray(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
@@ -72,16 +79,23 @@ class KeyframeWorker(QThread):
 
                 if keep:
                     cv2.imwrite(os.path.join(self.dst, fname), img)
-                    last_name, last_hash, last_img = fname, cur_hash, img.copy()
+                    last_hash, last_img = cur_hash, img.copy()
+                    runs.append([keyframe_count, leading if not runs else 0])
+                    keyframe_count += 1
                     self.message.emit(f"关键帧：{fname}")
 
-                meta[i] = last_name
+                runs[-1][1] += 1
                 self.progress.emit(i + 1)
 
+            if not runs:
+                self.message.emit("没有可读取的帧！")
+                self.finished.emit(False)
+                return
+
             with open(
                 os.path.join(self.dst, "metadata.json"), "w", encoding="utf-8"
             ) as f:
-                json.dump(meta, f, ensure_ascii=False)
+                json.dump({"runs": runs}, f)
             self.message.emit("完成 ✔")
             self.finished.emit(True)
         except Exception as e:
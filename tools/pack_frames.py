@@ -0,0 +1,42 @@
+"""序列帧打包工具
+
+将 frames 下的每个序列帧目录打包为同名 .sqfa 归档，SequenceFrame 会优先读取归档。
+
+用法：python tools/pack_frames.py [frames 目录或序列帧目录 ...]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_archive import pack  # noqa: E402
+
+
+def iter_sequences(path: str):
+    """path 本身含帧文件时视为单个序列帧目录，否则遍历其子目录"""
+    entries = sorted(os.listdir(path))
+    if any(name.endswith(".png") for name in entries):
+        yield path
+        return
+    for name in entries:
+        sub = os.path.join(path, name)
+        if os.path.isdir(sub):
+            yield sub
+
+
+def main():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parser = argparse.ArgumentParser(description="打包序列帧目录")
+    parser.add_argument("paths", nargs="*", default=[os.path.join(root, "frames")])
+    args = parser.parse_args()
+
+    for path in args.paths:
+        for res_name in iter_sequences(path):
+            archive = pack(res_name)
+            print(f"{res_name} -> {archive} ({os.path.getsize(archive)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""字体子集化工具
+
+在 offscreen 平台下构建 Animation 和时间轴，收集所有文字组件会显示的文字，
+为 fonts 下的完整字体生成只含这些字符的子集，输出到 resources。
+收集到的字符记录在 font_subsets.json 中，字符和源字体都没有变化时跳过，
+修改歌词后运行一次即可。依赖 fontTools，不在程序依赖中。
+
+用法：
+    uv run --with fonttools python tools/subset_fonts.py           # 按需重新生成
+    uv run --with fonttools python tools/subset_fonts.py --force   # 强制重新生成
+    uv run --with fonttools python tools/subset_fonts.py --check   # 需要重新生成时返回非零状态
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import string
+import sys
+from dataclasses import dataclass
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fontTools import subset  # noqa: E402
+from fontTools.ttLib import TTFont  # noqa: E402
+from PySide6.QtGui import QFontInfo, Qt, QTextDocument  # noqa: E402
+
+from components import ContainerWindow, DecoratedLabel, frame_cache  # noqa: E402
+from main import TEXT_STYLES, Animation, create_timeline  # noqa: E402
+from timeline import collect_texts  # noqa: E402
+
+STAMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "font_subsets.json")
+
+
+@dataclass
+class FontSubset:
+    """一个字体子集，source 不存在时以现有的 output 为源"""
+
+    source: str
+    output: str
+    font: str  # Animation 中对应的字体属性
+    fallback: bool = False  # 作为应用字体，其他字体缺字时可能回退到它，需包含全部文字
+    extra: str = ""
+
+
+FONTS = [
+    FontSubset(
+        "fonts/mogihaPen.ttf",
+        "resources/mogihaPen_subset.ttf",
+        "font1",
+        fallback=True,
+        extra=string.ascii_letters + string.digits + string.punctuation + " ",
+    ),
+    FontSubset("fonts/AkazukiPOP.otf", "resources/AkazukiPOP_subset.otf", "font2"),
+]
+
+
+def plain_text(text: str) -> str:
+    """富文本按 QLabel 的方式解析为纯文本"""
+    if Qt.mightBeRichText(text):
+        document = QTextDocument()
+        document.setHtml(text)
+        return document.toPlainText()
+    return text
+
+
+def collect_chars(app: Animation) -> dict[str, set[str]]:
+    """按实际使用的字体族收集字符，包括时间轴中的文字和窗口构建时的初始文字"""
+    timeline = create_timeline(app)
+    texts = [
+        (style.font(), text) for _, text, style in collect_texts(timeline, TEXT_STYLES)
+    ]
+    for name in app.lazy_names:
+        if name == "player":  # 没有音频
+            continue
+        obj = getattr(app, name)
+        for window in obj if isinstance(obj, list) else [obj]:
+            widget = getattr(window, "widget", None)
+            if isinstance(window, ContainerWindow) and isinstance(
+                widget, DecoratedLabel
+            ):
+                texts.append((widget.label.font(), widget.label.text()))
+
+    chars: dict[str, set[str]] = {}
+    for font, text in texts:
+        family = QFontInfo(font).family()
+        chars.setdefault(family, set()).update(plain_text(text))
+    return chars
+
+
+def font_chars(app: Animation, chars: dict[str, set[str]], font: FontSubset) -> str:
+    """font 需要包含的字符，去掉换行等控制字符"""
+    if font.fallback:
+        needed = set().union(*chars.values())
+    else:
+        needed = set(chars.get(getattr(app, font.font).family(), ()))
+    needed.update(font.extra)
+    return "".join(sorted(c for c in needed if c.isprintable()))
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build(source: str, output: str, text: str) -> list[str]:
+    """生成子集，返回源字体中没有的字符"""
+    font = TTFont(source)
+    cmap = font.getBestCmap()
+    missing = [c for c in text if ord(c) not in cmap]
+
+    options = subset.Options()
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.name_languages = ["*"]
+    options.hinting = False  # 只在大字号下显示，不需要微调
+    options.desubroutinize = True
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=text)
+    subsetter.subset(font)
+    font.save(output)
+    return missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="按时间轴文字生成字体子集")
+    parser.add_argument("--force", action="store_true", help="强制重新生成")
+    parser.add_argument("--check", action="store_true", help="只检查，不生成")
+    args = parser.parse_args()
+
+    # 首次运行时还没有子集，先用完整字体代替，使 Animation 能载入字体
+    for font in FONTS:
+        source, output = (
+            os.path.join(ROOT, path) for path in (font.source, font.output)
+        )
+        if not os.path.exists(output) and os.path.exists(source):
+            shutil.copyfile(source, output)
+
+    app = Animation(media=False)
+    chars = collect_chars(app)
+    frame_cache.clear()
+
+    stamps = {}
+    if os.path.exists(STAMP):
+        with open(STAMP, encoding="utf-8") as f:
+            stamps = json.load(f)
+
+    stale = []
+    for font in FONTS:
+        source = os.path.join(ROOT, font.source)
+        output = os.path.join(ROOT, font.output)
+        if not os.path.exists(source):
+            print(f"{font.source} not found, subsetting {font.output} instead")
+            source = output
+        text = font_chars(app, chars, font)
+        stamp = stamps.get(font.output, {})
+        up_to_date = (
+            os.path.exists(output)
+            and stamp.get("text") == text
+            and (source == output or stamp.get("source") == file_hash(source))
+        )
+        if up_to_date and not args.force:
+            print(f"{font.output} is up to date ({len(text)} chars)")
+            continue
+        stale.append(font.output)
+        if args.check:
+            print(f"{font.output} needs to be regenerated")
+            continue
+
+        before = os.path.getsize(output) if os.path.exists(output) else 0
+        missing = build(source, output, text)
+        if missing:
+            print(f"  missing in {os.path.basename(source)}: {''.join(missing)}")
+        print(
+            f"{font.output}: {len(text)} chars, "
+            f"{before} -> {os.path.getsize(output)} bytes"
+        )
+        stamps[font.output] = {
+            "source": stamp.get("source", "")
+            if source == output
+            else file_hash(source),
+            "text": text,
+        }
+
+    if args.check:
+        sys.exit(1 if stale else 0)
+    if stale:
+        with open(STAMP, "w", encoding="utf-8") as f:
+            json.dump(stamps, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()